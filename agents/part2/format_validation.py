@@ -9,63 +9,133 @@ Responsibilities:
 5. Document quality scoring
 """
 
+import functools
 import logging
 import re
 from collections import Counter
-from typing import Any, Dict, List, Set, Tuple
+from typing import Any, Dict, List, NamedTuple, Set, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 from agents import Part2Agent
+from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Below this many pages the NumPy setup cost outweighs the vectorized scan
+NUMPY_MIN_PAGES = 8
+
+# Suspicious keyword combinations (evaluated against lowercased text)
+SUSPICIOUS_PATTERNS = [
+    (re.compile(r'\b(urgent|immediately|asap)\b.*\b(transfer|send|wire)\b'), "urgency+transfer"),
+    (re.compile(r'\b(temporary|provisional|interim)\b.*\b(account|address)\b'), "temporary credentials"),
+    (re.compile(r'\b(do not|don\'t)\b.*\b(verify|check|validate)\b'), "anti-verification"),
+]
+
+PLACEHOLDERS = ['xxx', 'tbd', 'to be determined', '[placeholder]', 'lorem ipsum']
+
+# Sentence boundary as used by the capitalization check: terminator followed by whitespace
+_SENTENCE_BREAK_RE = re.compile(r'[.!?]\s+')
+_FIRST_NON_SPACE_RE = re.compile(r'\S')
+
+
+def _count_lowercase_sentence_starts(text: str) -> Tuple[int, int]:
+    """
+    Count sentences and sentences starting with a lowercase letter.
+
+    Equivalent to splitting on ``[.!?]\\s+`` and inspecting the first character
+    of each stripped sentence, but streams over the boundaries instead of
+    materializing every sentence substring.
+
+    Args:
+        text: Document text
+
+    Returns:
+        Tuple of (lowercase_starts, sentence_count)
+    """
+    lowercase_starts = 0
+    sentence_count = 1
+
+    first = _FIRST_NON_SPACE_RE.search(text)
+    if first and first.group().islower():
+        lowercase_starts += 1
+
+    for match in _SENTENCE_BREAK_RE.finditer(text):
+        sentence_count += 1
+        # \s+ is greedy, so the sentence starts right at the end of the match
+        if text[match.end():match.end() + 1].islower():
+            lowercase_starts += 1
+
+    return lowercase_starts, sentence_count
+
+
+class DocTemplate(NamedTuple):
+    """Expected structure for a document type."""
+    required_sections: Tuple[str, ...]
+    optional_sections: Tuple[str, ...]
+    min_length: int  # characters
+    min_pages: int
+    max_pages: int
+
 
 class FormatValidationAgent(Part2Agent):
     """Agent: Detect formatting errors, spelling, missing sections"""
 
     # Document type templates - expected sections for each type
     DOCUMENT_TEMPLATES = {
-        "purchase_agreement": {
-            "required_sections": ["buyer", "seller", "purchase", "price", "property", "date", "signature"],
-            "optional_sections": ["witness", "notary", "conditions"],
-            "min_length": 500,  # characters
-            "expected_pages": (1, 50)  # min, max pages
-        },
-        "proof_of_address": {
-            "required_sections": ["address", "name", "date"],
-            "optional_sections": ["account", "amount"],
-            "min_length": 200,
-            "expected_pages": (1, 5)
-        },
-        "id_document": {
-            "required_sections": ["name", "date of birth", "number", "expiry"],
-            "optional_sections": ["nationality", "sex"],
-            "min_length": 100,
-            "expected_pages": (1, 2)
-        },
-        "bank_statement": {
-            "required_sections": ["account", "balance", "date", "transactions"],
-            "optional_sections": ["interest", "fees"],
-            "min_length": 300,
-            "expected_pages": (1, 20)
-        },
-        "contract": {
-            "required_sections": ["parties", "terms", "date", "signature"],
-            "optional_sections": ["clauses", "amendments"],
-            "min_length": 500,
-            "expected_pages": (1, 100)
-        },
-        "invoice": {
-            "required_sections": ["invoice", "number", "date", "amount", "items"],
-            "optional_sections": ["tax", "discount"],
-            "min_length": 200,
-            "expected_pages": (1, 10)
-        },
-        "other": {
-            "required_sections": [],
-            "optional_sections": [],
-            "min_length": 50,
-            "expected_pages": (1, 1000)
-        }
+        "purchase_agreement": DocTemplate(
+            required_sections=("buyer", "seller", "purchase", "price", "property", "date", "signature"),
+            optional_sections=("witness", "notary", "conditions"),
+            min_length=500,  # characters
+            min_pages=1,
+            max_pages=50
+        ),
+        "proof_of_address": DocTemplate(
+            required_sections=("address", "name", "date"),
+            optional_sections=("account", "amount"),
+            min_length=200,
+            min_pages=1,
+            max_pages=5
+        ),
+        "id_document": DocTemplate(
+            required_sections=("name", "date of birth", "number", "expiry"),
+            optional_sections=("nationality", "sex"),
+            min_length=100,
+            min_pages=1,
+            max_pages=2
+        ),
+        "bank_statement": DocTemplate(
+            required_sections=("account", "balance", "date", "transactions"),
+            optional_sections=("interest", "fees"),
+            min_length=300,
+            min_pages=1,
+            max_pages=20
+        ),
+        "contract": DocTemplate(
+            required_sections=("parties", "terms", "date", "signature"),
+            optional_sections=("clauses", "amendments"),
+            min_length=500,
+            min_pages=1,
+            max_pages=100
+        ),
+        "invoice": DocTemplate(
+            required_sections=("invoice", "number", "date", "amount", "items"),
+            optional_sections=("tax", "discount"),
+            min_length=200,
+            min_pages=1,
+            max_pages=10
+        ),
+        "other": DocTemplate(
+            required_sections=(),
+            optional_sections=(),
+            min_length=50,
+            min_pages=1,
+            max_pages=1000
+        )
     }
 
     # Common English words for basic spell checking
@@ -127,8 +197,16 @@ class FormatValidationAgent(Part2Agent):
         'via', 'piazza', 'corso', 'viale'
     }
 
+    # Whole-document scan patterns, compiled once
+    _DATE_RE = re.compile(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b')
+    _AMOUNT_RE = re.compile(r'\$[\d,]+\.?\d*|\d+[,\d]*\.\d{2}')
+    _MIXED_RE = re.compile(r'\b[a-z]+\d+[a-z]+\b|\b\d+[a-z]+\d+\b')
+    _GIBBERISH_RE = re.compile(r'\b([a-z])\1{3,}\b')
+    _WORD_RE = re.compile(r'\b[a-zA-Z]{2,}\b')
+
     def __init__(self):
         super().__init__("format_validation")
+        self.full_spell_threshold = settings.full_spell_threshold
         
         # Initialize spell checker
         self.spell = None
@@ -142,6 +220,19 @@ class FormatValidationAgent(Part2Agent):
         except Exception as e:
             self.logger.warning(f"Failed to initialize spell checker: {e}")
 
+    @functools.cached_property
+    def _spell_whitelist(self) -> frozenset:
+        """Domain and foreign words to ignore; built on the first spell check."""
+        return frozenset(self.DOMAIN_TERMS | self.FOREIGN_WORDS)
+
+    @functools.cached_property
+    def _proper_noun_re(self) -> "re.Pattern[str]":
+        """PROPER_NOUN_PATTERNS as one compiled pattern; built on the first spell check."""
+        return re.compile(
+            "|".join(f"(?:{pattern})" for pattern in self.PROPER_NOUN_PATTERNS),
+            re.IGNORECASE
+        )
+
     async def execute(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute format validation: check structure, spelling, completeness.
@@ -180,33 +271,36 @@ class FormatValidationAgent(Part2Agent):
         format_valid = True
 
         try:
+            # Lowercase and tokenize once and share the results across all checks
+            text_lower = ocr_text.lower()
+            words = self._WORD_RE.findall(ocr_text)
+
             # Step 1: Get document template
             template = self.DOCUMENT_TEMPLATES.get(document_type, self.DOCUMENT_TEMPLATES["other"])
 
             # Step 2: Check text length
             text_length = len(ocr_text.strip())
-            if text_length < template["min_length"]:
+            if text_length < template.min_length:
                 format_issues.append({
                     "type": "length",
                     "severity": "high",
-                    "details": f"Document too short: {text_length} chars (expected min {template['min_length']})"
+                    "details": f"Document too short: {text_length} chars (expected min {template.min_length})"
                 })
                 completeness_score -= 20
                 format_valid = False
 
             # Step 3: Check page count
             page_count = len(page_texts)
-            min_pages, max_pages = template["expected_pages"]
-            if page_count < min_pages or page_count > max_pages:
+            if page_count < template.min_pages or page_count > template.max_pages:
                 format_issues.append({
                     "type": "page_count",
                     "severity": "medium",
-                    "details": f"Unexpected page count: {page_count} (expected {min_pages}-{max_pages})"
+                    "details": f"Unexpected page count: {page_count} (expected {template.min_pages}-{template.max_pages})"
                 })
                 completeness_score -= 10
 
             # Step 4: Check for required sections
-            missing_sections = self._check_required_sections(ocr_text, template["required_sections"])
+            missing_sections = self._check_required_sections(text_lower, template.required_sections)
             if missing_sections:
                 for section in missing_sections:
                     format_issues.append({
@@ -218,7 +312,7 @@ class FormatValidationAgent(Part2Agent):
                 format_valid = False
 
             # Step 5: Spelling check
-            spelling_errors, spelling_issues = self._check_spelling(ocr_text)
+            spelling_errors, spelling_issues = self._check_spelling(ocr_text, text_lower, words)
             misspelled_words = getattr(self, 'last_misspelled_words', [])
             
             if spelling_errors > 20:  # High error count
@@ -243,19 +337,13 @@ class FormatValidationAgent(Part2Agent):
             format_issues.extend(spelling_issues)
 
             # Step 6: Check for formatting red flags
-            red_flags = self._detect_red_flags(ocr_text, page_texts)
+            red_flags = self._detect_red_flags(text_lower, page_texts)
             format_issues.extend(red_flags)
             if red_flags:
                 completeness_score -= len(red_flags) * 5
             
             # Step 7: Check for capitalization issues
-            cap_issues = self._check_capitalization_patterns(ocr_text)
-            format_issues.extend(cap_issues)
-            if cap_issues:
-                completeness_score -= len(cap_issues) * 3
-
-            # Step 7: Check for capitalization issues
-            cap_issues = self._check_capitalization_patterns(ocr_text)
+            cap_issues = self._check_capitalization_patterns(ocr_text, words)
             format_issues.extend(cap_issues)
             if cap_issues:
                 completeness_score -= len(cap_issues) * 3
@@ -302,18 +390,17 @@ class FormatValidationAgent(Part2Agent):
 
         return state
 
-    def _check_required_sections(self, text: str, required_sections: List[str]) -> List[str]:
+    def _check_required_sections(self, text_lower: str, required_sections: Tuple[str, ...]) -> List[str]:
         """
         Check if all required sections are present in the document.
 
         Args:
-            text: Document text
+            text_lower: Lowercased document text
             required_sections: List of required section keywords
 
         Returns:
             List of missing sections
         """
-        text_lower = text.lower()
         missing = []
 
         for section in required_sections:
@@ -323,12 +410,25 @@ class FormatValidationAgent(Part2Agent):
 
         return missing
 
-    def _check_spelling(self, text: str) -> Tuple[int, List[Dict[str, Any]]]:
+    def _check_spelling(
+        self,
+        text: str,
+        text_lower: str,
+        words: List[str]
+    ) -> Tuple[int, List[Dict[str, Any]]]:
         """
         Perform basic spelling check on text.
 
+        Documents with more than ``full_spell_threshold`` words are spell-checked
+        on an evenly strided sample of words. Misspellings are counted as
+        distinct words against the whole document's word count, as in the full
+        check, so the count is not scaled; a typo that never falls in the
+        sample is missed. The other checks always see every word.
+
         Args:
             text: Document text
+            text_lower: Lowercased document text
+            words: Document words from _WORD_RE (letters only, original case)
 
         Returns:
             Tuple of (error_count, list of issues)
@@ -336,8 +436,8 @@ class FormatValidationAgent(Part2Agent):
         issues = []
         error_count = 0
 
-        # Extract words (letters only, lowercase)
-        words = re.findall(r'\b[a-z]{3,}\b', text.lower())
+        # Lowercase words of 3+ letters
+        words = [w.lower() for w in words if len(w) > 2]
         
         if not words:
             return 0, issues
@@ -347,27 +447,28 @@ class FormatValidationAgent(Part2Agent):
         total_words = len(words)
         unique_words = len(word_counts)
 
+        # Spell-check large documents on a deterministic sample (every Nth word)
+        spell_words = words
+        if self.full_spell_threshold and total_words > self.full_spell_threshold:
+            step = -(-total_words // self.full_spell_threshold)
+            spell_words = words[::step]
+
         # Use pyspellchecker if available
         actual_misspelled = []
         if self.spell:
             try:
                 # Find misspelled words
-                misspelled_set = self.spell.unknown(words)
+                misspelled_set = self.spell.unknown(spell_words)
                 
                 # Filter out false positives
                 filtered_misspelled = []
                 for word in misspelled_set:
                     # Skip if in domain terms
-                    if word in self.DOMAIN_TERMS or word in self.FOREIGN_WORDS:
+                    if word in self._spell_whitelist:
                         continue
                     
                     # Skip if matches proper noun pattern
-                    is_proper_noun = False
-                    for pattern in self.PROPER_NOUN_PATTERNS:
-                        if re.search(pattern, word, re.IGNORECASE):
-                            is_proper_noun = True
-                            break
-                    if is_proper_noun:
+                    if self._proper_noun_re.search(word):
                         continue
                     
                     # Skip if likely a proper noun (starts with capital and only appears capitalized)
@@ -440,8 +541,7 @@ class FormatValidationAgent(Part2Agent):
                 error_count += 5
 
         # 3. Check for repeated character patterns (aaa, bbb, etc.)
-        gibberish_pattern = r'\b([a-z])\1{3,}\b'  # 4+ repeated chars
-        gibberish_matches = re.findall(gibberish_pattern, text.lower())
+        gibberish_matches = self._GIBBERISH_RE.findall(text_lower)  # 4+ repeated chars
         if gibberish_matches:
             issues.append({
                 "type": "spelling",
@@ -451,8 +551,7 @@ class FormatValidationAgent(Part2Agent):
             error_count += len(gibberish_matches) * 2
 
         # 4. Check for numbers mixed with letters (l33t speak or OCR errors)
-        mixed_pattern = r'\b[a-z]+\d+[a-z]+\b|\b\d+[a-z]+\d+\b'
-        mixed_matches = re.findall(mixed_pattern, text.lower())
+        mixed_matches = self._MIXED_RE.findall(text_lower)
         if len(mixed_matches) > 5:
             issues.append({
                 "type": "spelling",
@@ -463,12 +562,16 @@ class FormatValidationAgent(Part2Agent):
 
         return error_count, issues
 
-    def _detect_red_flags(self, text: str, page_texts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _detect_red_flags(
+        self,
+        text_lower: str,
+        page_texts: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
         """
         Detect red flags that might indicate fraud or tampering.
 
         Args:
-            text: Full document text
+            text_lower: Lowercased full document text
             page_texts: List of page text objects
 
         Returns:
@@ -476,22 +579,40 @@ class FormatValidationAgent(Part2Agent):
         """
         red_flags = []
 
-        # 1. Check for blank pages
-        blank_pages = [p for p in page_texts if len(p.get("text", "").strip()) < 50]
-        if blank_pages:
+        # 1. Check for blank pages (prefer the is_blank flag set by the OCR agent)
+        blank_count = 0
+        for p in page_texts:
+            if "is_blank" in p:
+                is_blank = p["is_blank"]
+            else:
+                is_blank = len(p.get("text", "").strip()) < 50
+            if is_blank:
+                blank_count += 1
+        if blank_count:
             red_flags.append({
                 "type": "blank_pages",
                 "severity": "medium",
-                "details": f"Found {len(blank_pages)} blank or near-blank pages"
+                "details": f"Found {blank_count} blank or near-blank pages"
             })
 
         # 2. Check for inconsistent text density across pages
         if len(page_texts) > 1:
-            char_counts = [p.get("char_count", 0) for p in page_texts]
-            avg_chars = sum(char_counts) / len(char_counts)
-            
-            # Find pages with significantly different character counts
-            outliers = [i+1 for i, count in enumerate(char_counts) if abs(count - avg_chars) > avg_chars * 0.7]
+            if NUMPY_AVAILABLE and len(page_texts) >= NUMPY_MIN_PAGES:
+                char_counts = np.fromiter(
+                    (p.get("char_count", 0) for p in page_texts),
+                    dtype=np.int64,
+                    count=len(page_texts)
+                )
+                avg_chars = char_counts.mean()
+
+                # Find pages with significantly different character counts
+                outliers = (np.flatnonzero(np.abs(char_counts - avg_chars) > avg_chars * 0.7) + 1).tolist()
+            else:
+                char_counts = [p.get("char_count", 0) for p in page_texts]
+                avg_chars = sum(char_counts) / len(char_counts)
+
+                # Find pages with significantly different character counts
+                outliers = [i+1 for i, count in enumerate(char_counts) if abs(count - avg_chars) > avg_chars * 0.7]
             if outliers:
                 red_flags.append({
                     "type": "inconsistent_density",
@@ -500,15 +621,8 @@ class FormatValidationAgent(Part2Agent):
                 })
 
         # 3. Check for suspicious keyword combinations
-        text_lower = text.lower()
-        suspicious_patterns = [
-            (r'\b(urgent|immediately|asap)\b.*\b(transfer|send|wire)\b', "urgency+transfer"),
-            (r'\b(temporary|provisional|interim)\b.*\b(account|address)\b', "temporary credentials"),
-            (r'\b(do not|don\'t)\b.*\b(verify|check|validate)\b', "anti-verification"),
-        ]
-
-        for pattern, description in suspicious_patterns:
-            if re.search(pattern, text_lower):
+        for pattern, description in SUSPICIOUS_PATTERNS:
+            if pattern.search(text_lower):
                 red_flags.append({
                     "type": "suspicious_language",
                     "severity": "medium",
@@ -516,8 +630,7 @@ class FormatValidationAgent(Part2Agent):
                 })
 
         # 4. Check for placeholder text
-        placeholders = ['xxx', 'tbd', 'to be determined', '[placeholder]', 'lorem ipsum']
-        found_placeholders = [p for p in placeholders if p in text_lower]
+        found_placeholders = [p for p in PLACEHOLDERS if p in text_lower]
         if found_placeholders:
             red_flags.append({
                 "type": "placeholder_text",
@@ -527,42 +640,41 @@ class FormatValidationAgent(Part2Agent):
 
         return red_flags
 
-    def _check_capitalization_patterns(self, text: str) -> List[Dict[str, Any]]:
+    def _check_capitalization_patterns(self, text: str, words: List[str]) -> List[Dict[str, Any]]:
         """
         Check for unusual capitalization patterns that may indicate tampering or OCR errors.
         
         Args:
             text: Document text
+            words: Document words from _WORD_RE (letters only, excluding single letters)
             
         Returns:
             List of capitalization issues
         """
         issues = []
         
-        # Extract words (excluding single letters)
-        words = re.findall(r'\b[a-zA-Z]{2,}\b', text)
-        
         if not words:
             return issues
         
         # 1. Check for "WeIrD CaPs" pattern (alternating or random caps mid-word)
-        weird_caps = []
+        # Collect unique words in first-seen order, stopping at 10 for display
+        weird_caps = {}
         for word in words:
             # Skip if all uppercase (acronyms) or all lowercase or proper capitalization
             if word.isupper() or word.islower() or word.istitle():
                 continue
             
             # Check for mixed case (not just first letter capitalized)
-            if any(c.isupper() for c in word[1:]) and any(c.islower() for c in word[1:]):
-                weird_caps.append(word)
+            if word not in weird_caps and any(c.isupper() for c in word[1:]) and any(c.islower() for c in word[1:]):
+                weird_caps[word] = None
+                if len(weird_caps) >= 10:
+                    break
         
         if weird_caps:
-            # Get unique weird caps (limit to first 10 for display)
-            unique_weird = list(set(weird_caps))[:10]
             issues.append({
                 "type": "capitalization",
                 "severity": "medium",
-                "details": f"Unusual capitalization detected: {', '.join(unique_weird)}"
+                "details": f"Unusual capitalization detected: {', '.join(weird_caps)}"
             })
         
         # 2. Check for excessive ALL CAPS (more than 20% of words)
@@ -578,17 +690,9 @@ class FormatValidationAgent(Part2Agent):
         
         # 3. Check for words starting with lowercase in sentence positions
         # (indicates poor OCR or typing)
-        sentences = re.split(r'[.!?]\s+', text)
-        lowercase_starts = 0
-        
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if sentence and len(sentence) > 0:
-                # Check if first character is lowercase letter
-                if sentence[0].islower():
-                    lowercase_starts += 1
+        lowercase_starts, sentence_count = _count_lowercase_sentence_starts(text)
         
-        if lowercase_starts > len(sentences) * 0.3:  # More than 30% lowercase sentence starts
+        if lowercase_starts > sentence_count * 0.3:  # More than 30% lowercase sentence starts
             issues.append({
                 "type": "capitalization",
                 "severity": "low",
@@ -624,7 +728,7 @@ class FormatValidationAgent(Part2Agent):
             })
 
         # 2. Check for date consistency
-        dates = re.findall(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b', text)
+        dates = self._DATE_RE.findall(text)
         if len(dates) > 1:
             # Check if dates are in multiple formats (inconsistent)
             formats = set()
@@ -642,7 +746,7 @@ class FormatValidationAgent(Part2Agent):
                 })
 
         # 3. Check for number formatting consistency
-        amounts = re.findall(r'\$[\d,]+\.?\d*|\d+[,\d]*\.\d{2}', text)
+        amounts = self._AMOUNT_RE.findall(text)
         if amounts:
             comma_style = sum(1 for a in amounts if ',' in a)
             no_comma_style = len(amounts) - comma_style
@@ -23,6 +23,79 @@ from agents import Part2Agent
 
 logger = logging.getLogger(__name__)
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import orjson
+
+    def _json_loads(text):
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(text if isinstance(text, bytes) else text.encode())
+except ImportError:
+    _json_loads = json.loads
+
+# Markdown code fence around an LLM JSON payload; an unterminated fence runs to the end
+_CODE_BLOCK_RE = re.compile(r"```(?:json)?\s*(.*?)(?:```|\Z)", re.DOTALL)
+
+# Fallback (no-LLM) validation rules, matched case-insensitively
+PLACEHOLDERS = ('[placeholder]', 'xxx', 'tbd', 'to be determined', 'lorem ipsum')
+
+# (first, later, description): flagged when `later` occurs after `first` ends
+CONTRADICTORY_TERMS = [
+    ('agree', 'disagree', 'Agreement and disagreement mentioned'),
+    ('valid', 'invalid', 'Document states both valid and invalid'),
+    ('accept', 'reject', 'Both acceptance and rejection mentioned'),
+    ('approve', 'deny', 'Both approval and denial mentioned')
+]
+
+PLACEHOLDER_PATTERNS = [
+    (re.compile(re.escape(placeholder), re.IGNORECASE), placeholder)
+    for placeholder in PLACEHOLDERS
+]
+
+CONTRADICTORY_PATTERNS = [
+    (re.compile(f'{first}.*?{later}', re.IGNORECASE | re.DOTALL), description)  # DOTALL: match across lines
+    for first, later, description in CONTRADICTORY_TERMS
+]
+
+# The automaton matches lowercase keywords, so text is lowercased in chunks of
+# this many characters (overlapping by the longest keyword) instead of as a whole
+KEYWORD_SCAN_CHUNK = 64 * 1024
+
+
+def _build_keyword_automaton():
+    """One Aho-Corasick automaton over placeholders and contradiction terms"""
+    automaton = ahocorasick.Automaton()
+    for first, later, _ in CONTRADICTORY_TERMS:
+        automaton.add_word(first, first)
+        automaton.add_word(later, later)
+    for placeholder in PLACEHOLDERS:
+        automaton.add_word(placeholder, placeholder)
+    automaton.make_automaton()
+    return automaton
+
+
+# ASCII-only lowercasing table: every keyword is ASCII, and ASCII bytes never
+# occur inside UTF-8 multi-byte sequences, so translating the encoded text is safe
+_ASCII_LOWER = bytes.maketrans(bytes(range(65, 91)), bytes(range(97, 123)))
+
+
+def _lower_keywords(text: str) -> str:
+    """Lowercase ASCII letters only; avoids str.lower()'s slow non-ASCII path"""
+    if text.isascii():
+        return text.lower()
+    return text.encode("utf-8", "surrogatepass").translate(_ASCII_LOWER).decode("utf-8", "surrogatepass")
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton() if AHOCORASICK_AVAILABLE else None
+_KEYWORD_OVERLAP = max(
+    len(word) for word in PLACEHOLDERS + tuple(w for t in CONTRADICTORY_TERMS for w in t[:2])
+) - 1
+
 
 class NLPValidationAgent(Part2Agent):
     """Agent: Semantic validation and consistency checking using LLM"""
@@ -116,6 +189,16 @@ Document text:
 Respond in JSON format with consistency_score, contradictions, and calculation_errors."""
     }
 
+    # Each prompt split around its single {text} slot, braces unescaped, so a
+    # prompt is built with one join instead of a str.format parse per call
+    _PROMPT_PARTS = {
+        doc_type: tuple(
+            part.replace("{{", "{").replace("}}", "}") for part in template.split("{text}")
+        )
+        for doc_type, template in VALIDATION_PROMPTS.items()
+    }
+    _DEFAULT_PROMPT_PARTS = _PROMPT_PARTS["contract"]  # Unknown types use the contract prompt
+
     def __init__(self, llm_service=None):
         super().__init__("nlp_validation")
         self.llm_service = llm_service
@@ -187,8 +270,9 @@ Respond in JSON format with consistency_score, contradictions, and calculation_e
                         semantic_issues.extend(missing_logic)
                     
                     # Determine if valid based on score and severity
-                    high_severity_issues = [i for i in semantic_issues if i.get("severity") == "high"]
-                    if consistency_score < 70 or len(high_severity_issues) > 0:
+                    if consistency_score < 70 or any(
+                        i.get("severity") == "high" for i in semantic_issues
+                    ):
                         nlp_valid = False
                     
                     self.logger.info(
@@ -251,16 +335,13 @@ Respond in JSON format with consistency_score, contradictions, and calculation_e
         """
         try:
             # Get the appropriate prompt for document type
-            prompt_template = self.VALIDATION_PROMPTS.get(
-                document_type,
-                self.VALIDATION_PROMPTS["contract"]  # Default to contract
-            )
+            prefix, suffix = self._PROMPT_PARTS.get(document_type, self._DEFAULT_PROMPT_PARTS)
             
             # Truncate text if too long (keep first 3000 chars)
             if len(text) > 3000:
-                text = text[:3000] + "\n...[truncated]"
-            
-            prompt = prompt_template.format(text=text)
+                prompt = "".join((prefix, text[:3000], "\n...[truncated]", suffix))
+            else:
+                prompt = "".join((prefix, text, suffix))
             
             # Call LLM service
             response = await self.llm_service.generate(
@@ -270,20 +351,11 @@ Respond in JSON format with consistency_score, contradictions, and calculation_e
             )
             
             # Parse JSON response
-            # Try to extract JSON from response
-            response_text = response.strip()
-            
             # Handle markdown code blocks
-            if "```json" in response_text:
-                start = response_text.find("```json") + 7
-                end = response_text.find("```", start)
-                response_text = response_text[start:end].strip()
-            elif "```" in response_text:
-                start = response_text.find("```") + 3
-                end = response_text.find("```", start)
-                response_text = response_text[start:end].strip()
+            match = _CODE_BLOCK_RE.search(response)
+            response_text = match.group(1).strip() if match else response.strip()
             
-            results = json.loads(response_text)
+            results = _json_loads(response_text)
             return results
             
         except json.JSONDecodeError as e:
@@ -314,41 +386,29 @@ Respond in JSON format with consistency_score, contradictions, and calculation_e
         score = 100
         
         # Check for basic semantic issues
-        text_lower = text.lower()
+        found_placeholders, contradictions = self._scan_keywords(text)
         
         # Check for placeholder/incomplete content
-        placeholders = ['[placeholder]', 'xxx', 'tbd', 'to be determined', 'lorem ipsum']
-        for placeholder in placeholders:
-            if placeholder in text_lower:
-                issues.append({
-                    "type": "incomplete",
-                    "severity": "high",
-                    "description": f"Document contains placeholder: {placeholder}"
-                })
-                score -= 20
+        for placeholder in found_placeholders:
+            issues.append({
+                "type": "incomplete",
+                "severity": "high",
+                "description": f"Document contains placeholder: {placeholder}"
+            })
+            score -= 20
         
         # Check for contradictory language
-        import re
-        contradictory_patterns = [
-            (r'agree.*?disagree', 'Agreement and disagreement mentioned'),
-            (r'valid.*?invalid', 'Document states both valid and invalid'),
-            (r'accept.*?reject', 'Both acceptance and rejection mentioned'),
-            (r'approve.*?deny', 'Both approval and denial mentioned')
-        ]
-        
-        for pattern, description in contradictory_patterns:
-            # Search in the full text with DOTALL flag to match across lines
-            if re.search(pattern, text_lower, re.DOTALL):
-                issues.append({
-                    "type": "contradiction",
-                    "severity": "high",  # Changed to high severity
-                    "description": description
-                })
-                score -= 20  # Higher penalty for contradictions
+        for description in contradictions:
+            issues.append({
+                "type": "contradiction",
+                "severity": "high",  # Changed to high severity
+                "description": description
+            })
+            score -= 20  # Higher penalty for contradictions
         
         # Check for timeline consistency (basic)
         dates = entities.get("dates", [])
-        if len(dates) > 1:
+        if len(dates) > 5:  # Fewer entries cannot hold more than 5 distinct dates
             # Just flag if many different dates (may indicate inconsistency)
             unique_dates = len(set(dates))
             if unique_dates > 5:
@@ -364,6 +424,47 @@ Respond in JSON format with consistency_score, contradictions, and calculation_e
             "issues": issues
         }
 
+    def _scan_keywords(self, text: str):
+        """
+        Find placeholders and contradictory term pairs, ignoring case.
+
+        Uses a single Aho-Corasick pass when pyahocorasick is installed,
+        otherwise one case-insensitive regex scan per rule. Neither path
+        builds a lowercased copy of the whole document.
+
+        Returns:
+            (placeholders found, contradiction descriptions), in rule order
+        """
+        if _KEYWORD_AUTOMATON is None:
+            found_placeholders = [
+                placeholder for pattern, placeholder in PLACEHOLDER_PATTERNS
+                if pattern.search(text)
+            ]
+            contradictions = [
+                description for pattern, description in CONTRADICTORY_PATTERNS
+                if pattern.search(text)
+            ]
+            return found_placeholders, contradictions
+        
+        # Earliest end and latest start of every keyword. Chunks overlap by the
+        # longest keyword so no match straddles a boundary unseen; a match in an
+        # overlap is seen twice at the same position, which is harmless
+        first_end = {}
+        last_start = {}
+        for chunk_start in range(0, len(text), KEYWORD_SCAN_CHUNK):
+            base = max(0, chunk_start - _KEYWORD_OVERLAP)
+            chunk = _lower_keywords(text[base:chunk_start + KEYWORD_SCAN_CHUNK])
+            for end, word in _KEYWORD_AUTOMATON.iter(chunk):
+                first_end.setdefault(word, base + end)
+                last_start[word] = base + end - len(word) + 1
+        
+        found_placeholders = [p for p in PLACEHOLDERS if p in first_end]
+        contradictions = [
+            description for first, later, description in CONTRADICTORY_TERMS
+            if first in first_end and later in last_start and first_end[first] < last_start[later]
+        ]
+        return found_placeholders, contradictions
+
     def extract_transaction_ids(self, text: str) -> List[Dict[str, Any]]:
         """
         Extract transaction IDs from document text using pattern matching.
@@ -9,19 +9,31 @@ Responsibilities:
 5. Save OCR output for downstream processing
 """
 
+import asyncio
+import hashlib
+import io
+import json
 import logging
 import os
 import re
-from datetime import datetime
+import shutil
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Dict, List, Optional
-from io import BytesIO
+
+import numpy as np
 
 try:
     import fitz  # PyMuPDF
 except ImportError:
     import PyMuPDF as fitz
 
+from agents import Part2Agent
+from config import settings
+
+logger = logging.getLogger(__name__)
+
 try:
     from PIL import Image
     import pytesseract
@@ -30,35 +42,179 @@ except ImportError:
     TESSERACT_AVAILABLE = False
     logger.warning("Tesseract/PIL not available - OCR for scanned documents will be limited")
 
-from agents import Part2Agent
-from config import settings
-
-logger = logging.getLogger(__name__)
+try:
+    import zstandard as zstd
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+    logger.warning("zstandard not available - OCR output will be stored uncompressed")
+
+# Configure Tesseract if available (backup); the binary path is checked once per process
+if TESSERACT_AVAILABLE and os.path.exists(settings.tesseract_path):
+    pytesseract.pytesseract.tesseract_cmd = settings.tesseract_path
+TESSERACT_BINARY_FOUND = (
+    TESSERACT_AVAILABLE and shutil.which(pytesseract.pytesseract.tesseract_cmd) is not None
+)
+
+# LSTM engine; default page segmentation (inputs are whole pages or page images)
+TESSERACT_CONFIG = "--oem 1"
+
+# OCR output is one JSON record per page; level 3 compresses text several-fold
+# at well above disk write speed
+OCR_OUTPUT_ZSTD_LEVEL = 3
+
+# Pages with fewer (stripped) characters than this are flagged as blank
+BLANK_PAGE_CHARS = 50
+
+# Embedded images drawn smaller than this (PDF points squared) are treated as
+# decorative (bullets, logos, rules) and not OCR'd
+MIN_OCR_IMAGE_AREA = 50 * 50
+
+# Entity extraction patterns. The date formats share one alternation scanned in
+# one pass; the other entity types stay separate passes because their matches
+# legitimately overlap (a phone-like digit run inside a date or amount)
+DATE_RE = re.compile(
+    r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b'  # DD/MM/YYYY
+    r'|\b\d{4}[/-]\d{1,2}[/-]\d{1,2}\b'   # YYYY-MM-DD
+    r'|\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2},? \d{4}\b',  # Month DD, YYYY
+    re.IGNORECASE
+)
+AMOUNT_RE = re.compile(r'[\$£€¥]\s*[\d,]+\.?\d*|\b\d+[,\.\d]*\s*(?:USD|EUR|GBP|CHF|SGD|HKD)\b', re.IGNORECASE)
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_RE = re.compile(r'[\+]?[(]?[0-9]{1,3}[)]?[-\s\.]?[(]?[0-9]{1,4}[)]?[-\s\.]?[0-9]{1,4}[-\s\.]?[0-9]{1,9}')
+NAME_RE = re.compile(r'\b(?:Mr|Mrs|Ms|Dr|Prof)\.?\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b')
+
+MAX_ENTITIES_PER_TYPE = 10
+ENTITY_CACHE_SIZE = 128  # Process-wide LRU of entity results keyed by text hash
+
+
+def _first_unique_matches(pattern: re.Pattern, text: str, limit: int = MAX_ENTITIES_PER_TYPE) -> List[str]:
+    """First `limit` distinct matches of pattern in text, in document order"""
+    found = {}
+    for match in pattern.finditer(text):
+        found[match.group()] = None
+        if len(found) >= limit:
+            break
+    return list(found)
+
+
+# Text cleaning: control characters are dropped, then whitespace runs (which
+# include the whitespace-class controls \x0b, \x0c, \x1c-\x1f, \x85) collapse
+_CONTROL_CHARS = [
+    chr(c) for c in [*range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20), *range(0x7f, 0xa0)]
+    if not chr(c).isspace()
+]
+CONTROL_CHARS_TRANS = dict.fromkeys(map(ord, _CONTROL_CHARS))
+CONTROL_CHARS_RE = re.compile(f"[{re.escape(''.join(_CONTROL_CHARS))}]")
+WHITESPACE_RE = re.compile(r'\s+')
+
+# When OCR candidates cover this fraction of the page it is treated as a scan:
+# the page is rendered once instead of decoding (and stitching) each image
+SCANNED_PAGE_COVERAGE = 0.5
+
+# Text-line crops recognized per forward pass on GPU (EasyOCR's default of 1
+# runs one crop per kernel launch); CPU keeps the default
+EASYOCR_GPU_BATCH_SIZE = 32
 
 
 class OCRAgent(Part2Agent):
-    """Agent: Extract text from PDF documents using PyMuPDF and EasyOCR"""
+    """Agent: Extract text from PDF documents using PyMuPDF and EasyOCR/Tesseract"""
+
+    # EasyOCR loads its detection and recognition models on construction and the
+    # workflow builds a new agent per document, so one reader is shared per process
+    _shared_reader = None
+    _reader_on_gpu = False
+    _reader_lock = threading.Lock()
+    _tesseract_lang: Optional[str] = None  # settings.tesseract_lang limited to installed packs
+
+    # Re-run workflows extract entities from the same OCR text again; keyed by a
+    # digest so megabyte-sized texts are not kept alive as cache keys
+    _entity_cache: "OrderedDict[bytes, Dict[str, tuple]]" = OrderedDict()
+    _entity_cache_lock = threading.Lock()
 
     def __init__(self):
         super().__init__("ocr")
         self.ocr_output_dir = settings.ocr_output_dir
         os.makedirs(self.ocr_output_dir, exist_ok=True)
         
-        # Initialize EasyOCR
+        # Pick the OCR engine; EasyOCR models are only loaded when it is used
+        self.reader = None
+        self.ocr_backend = self._select_ocr_backend()
+        if self.ocr_backend == "easyocr":
+            try:
+                self.reader = self._get_reader()
+            except ImportError:
+                self.logger.warning("EasyOCR not available - OCR will be limited")
+                self.ocr_backend = "tesseract" if TESSERACT_BINARY_FOUND else None
+        if self.ocr_backend == "tesseract":
+            self.tesseract_lang = self._get_tesseract_lang()
+        self.logger.info(f"OCR backend: {self.ocr_backend or 'none'}")
+
+    @staticmethod
+    def _select_ocr_backend() -> str:
+        """
+        Resolve settings.ocr_backend to "easyocr" or "tesseract".
+
+        EasyOCR is the default. "auto" opts in to Tesseract on CPU-only
+        hosts (where it is several times faster per page), keeping EasyOCR
+        when CUDA is available or no Tesseract binary is installed.
+        """
+        backend = settings.ocr_backend.lower()
+        if backend in ("easyocr", "tesseract"):
+            return backend
+        
         try:
-            import easyocr
-            self.logger.info("Initializing EasyOCR reader...")
-            self.reader = easyocr.Reader(['en'], gpu=False)
-            self.logger.info("EasyOCR reader initialized")
+            import torch
+            gpu = torch.cuda.is_available()
         except ImportError:
-            self.logger.warning("EasyOCR not available - OCR will be limited")
-            self.reader = None
-        
-        # Configure Tesseract if available (backup)
-        if TESSERACT_AVAILABLE and hasattr(settings, 'tesseract_path'):
-            tesseract_path = settings.tesseract_path
-            if os.path.exists(tesseract_path):
-                pytesseract.pytesseract.tesseract_cmd = tesseract_path
+            gpu = False
+        return "tesseract" if TESSERACT_BINARY_FOUND and not gpu else "easyocr"
+
+    @classmethod
+    def _get_reader(cls):
+        """Return the process-wide EasyOCR reader, creating it on first use"""
+        with cls._reader_lock:
+            if cls._shared_reader is None:
+                import easyocr
+                import torch  # EasyOCR dependency
+                gpu = torch.cuda.is_available()
+                if not gpu:
+                    # Pages are OCR'd concurrently; split the cores between them instead
+                    # of letting every page's inference spawn a thread per core
+                    pages = max(1, settings.ocr_max_concurrent_pages)
+                    torch.set_num_threads(max(1, (os.cpu_count() or 1) // pages))
+                logger.info(f"Initializing EasyOCR reader ({'GPU' if gpu else 'CPU'})...")
+                # cuDNN autotuning picks the fastest convolution kernels per input shape
+                cls._shared_reader = easyocr.Reader(['en'], gpu=gpu, cudnn_benchmark=gpu)
+                cls._reader_on_gpu = gpu
+                logger.info("EasyOCR reader initialized")
+        return cls._shared_reader
+
+    @classmethod
+    def _get_tesseract_lang(cls) -> str:
+        """
+        Return settings.tesseract_lang without language packs missing from
+        the Tesseract install, falling back to "eng".
+
+        Tesseract fails the whole call when any requested traineddata is
+        missing, so an unavailable pack (e.g. chi_sim on a stock install)
+        would otherwise leave every scanned page empty.
+        """
+        with cls._reader_lock:
+            if cls._tesseract_lang is None:
+                requested = [lang for lang in settings.tesseract_lang.split("+") if lang]
+                try:
+                    installed = set(pytesseract.get_languages(config=""))
+                except Exception as e:
+                    logger.warning(f"Could not list Tesseract languages: {e}")
+                    installed = {"eng"}
+                langs = [lang for lang in requested if lang in installed]
+                missing = [lang for lang in requested if lang not in installed]
+                if missing:
+                    logger.warning(f"Tesseract language pack(s) not installed: {', '.join(missing)}")
+                cls._tesseract_lang = "+".join(langs) or "eng"
+                logger.info(f"Tesseract language: {cls._tesseract_lang}")
+        return cls._tesseract_lang
 
     async def execute(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -74,7 +230,7 @@ class OCRAgent(Part2Agent):
         Returns:
             Updated state with:
                 - ocr_text: Extracted text content
-                - ocr_output_path: Path to saved OCR output
+                - ocr_output_path: Path to saved per-page OCR output (JSON lines, zstd-compressed)
                 - page_texts: List of text per page
                 - text_length: Total character count
                 - has_text: Boolean if text was extracted
@@ -119,11 +275,10 @@ class OCRAgent(Part2Agent):
             # Save OCR output to file
             ocr_output_path = os.path.join(
                 self.ocr_output_dir,
-                f"{document_id}_ocr.txt"
+                f"{document_id}_ocr.jsonl" + (".zst" if ZSTD_AVAILABLE else "")
             )
             
-            with open(ocr_output_path, 'w', encoding='utf-8') as f:
-                f.write(ocr_text)
+            self._write_ocr_output(ocr_output_path, page_texts)
 
             self.logger.info(
                 f"OCR completed: {document_id}, "
@@ -153,6 +308,53 @@ class OCRAgent(Part2Agent):
 
         return state
 
+    def _write_ocr_output(self, path: str, page_texts: List[Dict[str, Any]]) -> None:
+        """
+        Write the OCR output to disk as one JSON record per page.
+
+        Records are the page_texts entries, so consumers can stream pages
+        (zstd stream_reader + line iteration) without loading the whole
+        document. Compressed with zstandard when available.
+
+        Args:
+            path: Output file path (.jsonl or .jsonl.zst)
+            page_texts: Per-page entries from _process_pdf/_process_image
+        """
+        with open(path, 'wb') as f:
+            if ZSTD_AVAILABLE:
+                cctx = zstd.ZstdCompressor(level=OCR_OUTPUT_ZSTD_LEVEL)
+                with cctx.stream_writer(f, closefd=False) as writer:
+                    self._write_page_records(writer, page_texts)
+            else:
+                self._write_page_records(f, page_texts)
+
+    @staticmethod
+    def _write_page_records(stream, page_texts: List[Dict[str, Any]]) -> None:
+        """Write each page entry to a binary stream as a UTF-8 JSON line"""
+        for page in page_texts:
+            stream.write((json.dumps(page, ensure_ascii=False) + "\n").encode("utf-8"))
+
+    @staticmethod
+    def read_ocr_output(path: str):
+        """
+        Stream the page records written by _write_ocr_output.
+
+        Args:
+            path: Value of state["ocr_output_path"]
+
+        Yields:
+            Page dicts with page_number, text and method
+        """
+        with open(path, 'rb') as f:
+            if path.endswith(".zst"):
+                reader = zstd.ZstdDecompressor().stream_reader(f)
+                lines = io.TextIOWrapper(reader, encoding='utf-8')
+            else:
+                lines = io.TextIOWrapper(f, encoding='utf-8')
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+
     async def _process_pdf(self, file_path: str, document_id: str) -> tuple:
         """Process PDF document for text extraction"""
         ocr_text = ""
@@ -163,59 +365,113 @@ class OCRAgent(Part2Agent):
             f"Processing {len(doc)} pages from {Path(file_path).name}"
         )
 
+        raw_pages = []  # (text, extraction method) per page, before OCR results
+        ocr_tasks = {}  # page_num -> OCR task
+        # A single GPU runs one page at a time (concurrent batches risk running out of memory)
+        ocr_slots = asyncio.Semaphore(
+            1 if self._reader_on_gpu else max(1, settings.ocr_max_concurrent_pages)
+        )
+
+        # Sample the first, middle and last pages: when none of them has a text
+        # layer the document is treated as a scan, and pages whose images cover
+        # the page go straight to OCR without a text extraction (done later
+        # only if OCR comes back empty)
+        sample_texts = {
+            i: doc[i].get_text("text") for i in sorted({0, len(doc) // 2, len(doc) - 1})
+        } if len(doc) else {}
+        scanned_doc = len(doc) > len(sample_texts) and all(
+            len(text.strip()) < BLANK_PAGE_CHARS for text in sample_texts.values()
+        )
+        if scanned_doc:
+            self.logger.info("Sampled pages have no text layer - treating document as scanned")
+
         # Extract text from each page
         for page_num in range(len(doc)):
             page = doc[page_num]
-            
-            # Try multiple extraction methods
-            page_text = page.get_text("text")
             extraction_method = "pdf_text_layer"
             
-            self.logger.info(
-                f"Page {page_num + 1}: Extracted {len(page_text)} chars from text layer, "
-                f"has {len(page.get_images())} images"
-            )
+            if page_num in sample_texts:
+                page_text = sample_texts[page_num]
+                image_list = None
+            elif scanned_doc:
+                image_list = page.get_images()
+                page_text = None if image_list else page.get_text("text")
+            else:
+                page_text = page.get_text("text")
+                image_list = None
             
-            # If minimal text, try extracting from all methods
-            if len(page_text.strip()) < 100:
-                # Try different extraction modes
-                for method in ["text", "blocks", "dict", "rawdict"]:
-                    try:
-                        alt_text = page.get_text(method)
-                        if isinstance(alt_text, str) and len(alt_text) > len(page_text):
-                            page_text = alt_text
-                            extraction_method = f"pdf_{method}"
-                            self.logger.info(f"Better extraction with method '{method}': {len(page_text)} chars")
-                    except:
-                        pass
+            if page_text is not None:
+                self.logger.info(
+                    f"Page {page_num + 1}: Extracted {len(page_text)} chars from text layer"
+                )
+                # Image list is only needed (and only walked) when the text layer is thin
+                if image_list is None and len(page_text.strip()) < 50:
+                    image_list = page.get_images()
             
-            # If still no text and page has images, try OCR
-            if len(page_text.strip()) < 50 and page.get_images():
+            # If still no text and page has images, queue OCR. PyMuPDF work stays on
+            # this thread; OCR inference runs in worker threads, and the semaphore
+            # bounds how many pages' pixels are held in memory at once
+            if image_list:
                 self.logger.info(
-                    f"Page {page_num + 1} has minimal text, attempting OCR on {len(page.get_images())} images"
+                    f"Page {page_num + 1} has minimal text, attempting OCR on {len(image_list)} images"
                 )
-                if self.reader:
-                    ocr_page_text = self._ocr_page_images(page, page_num)
-                    if ocr_page_text and len(ocr_page_text) > len(page_text):
-                        page_text = ocr_page_text
-                        extraction_method = "easyocr"
-                        self.logger.info(f"OCR extracted {len(ocr_page_text)} chars")
+                if self.ocr_backend:
+                    await ocr_slots.acquire()
+                    try:
+                        ocr_input = self._collect_ocr_input(page, page_num, image_list)
+                    except Exception as e:
+                        self.logger.error(f"Error in OCR processing for page {page_num + 1}: {e}")
+                        ocr_input = None
+                    if ocr_input is not None and page_text is None and "page" not in ocr_input:
+                        # Images cover only part of this page, so it may mix native
+                        # text with photos or signatures: check the text layer first
+                        page_text = page.get_text("text")
+                        self.logger.info(
+                            f"Page {page_num + 1}: Extracted {len(page_text)} chars from text layer"
+                        )
+                        if len(page_text.strip()) >= BLANK_PAGE_CHARS:
+                            ocr_input = None
+                    if ocr_input is None:
+                        ocr_slots.release()
+                    else:
+                        ocr_tasks[page_num] = asyncio.create_task(
+                            self._ocr_page_in_thread(ocr_input, page_num, ocr_slots)
+                        )
                 else:
-                    self.logger.warning("EasyOCR not available - cannot OCR scanned pages")
+                    self.logger.warning("No OCR engine available - cannot OCR scanned pages")
                     extraction_method = "no_ocr_available"
             
+            raw_pages.append((page_text, extraction_method))
+
+        ocr_results = dict(zip(ocr_tasks, await asyncio.gather(*ocr_tasks.values())))
+
+        # Scanned-mode pages whose OCR found nothing fall back to their text layer
+        # (all OCR threads have finished, so PyMuPDF is used from this thread only)
+        for page_num, (page_text, extraction_method) in enumerate(raw_pages):
+            if page_text is None and not ocr_results.get(page_num):
+                raw_pages[page_num] = (doc[page_num].get_text("text"), extraction_method)
+
+        doc.close()
+        
+        for page_num, (page_text, extraction_method) in enumerate(raw_pages):
+            ocr_page_text = ocr_results.get(page_num)
+            if ocr_page_text and (page_text is None or len(ocr_page_text) > len(page_text)):
+                page_text = ocr_page_text
+                extraction_method = self.ocr_backend
+                self.logger.info(f"Page {page_num + 1}: OCR extracted {len(ocr_page_text)} chars")
+            
             # Clean the text
             page_text = self._clean_text(page_text)
             
+            # _clean_text strips, so char_count is already the stripped length
             page_texts.append({
                 "page_number": page_num + 1,
                 "text": page_text,
                 "char_count": len(page_text),
+                "is_blank": len(page_text) < BLANK_PAGE_CHARS,
                 "method": extraction_method
             })
 
-        doc.close()
-
         # Combine all page texts
         ocr_text = "\n\n".join([
             f"[Page {p['page_number']}]\n{p['text']}" 
@@ -232,11 +488,8 @@ class OCRAgent(Part2Agent):
         """Process direct image file (JPG/PNG) for text extraction"""
         self.logger.info(f"Running OCR on {file_format.upper()} image: {Path(file_path).name}")
         
-        # Use EasyOCR on the image file directly
-        result = self.reader.readtext(file_path)
-        
-        # Extract text from OCR results
-        extracted_text = " ".join([item[1] for item in result])
+        # OCR the image file directly
+        extracted_text = self._ocr_image(file_path)
         
         # Clean the text
         cleaned_text = self._clean_text(extracted_text)
@@ -246,7 +499,8 @@ class OCRAgent(Part2Agent):
             "page_number": 1,
             "text": cleaned_text,
             "char_count": len(cleaned_text),
-            "method": "easyocr"
+            "is_blank": len(cleaned_text) < BLANK_PAGE_CHARS,
+            "method": self.ocr_backend
         }]
         
         # Format as if it's a single page
@@ -269,20 +523,15 @@ class OCRAgent(Part2Agent):
         if not text:
             return ""
 
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove control characters
-        text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]', '', text)
-        
-        # Normalize line breaks
-        text = text.replace('\r\n', '\n').replace('\r', '\n')
-        
-        # Remove multiple consecutive newlines
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        # Remove control characters. str.translate is a single C pass for ASCII
+        # text but slower than the regex once the string holds wider characters
+        if text.isascii():
+            text = text.translate(CONTROL_CHARS_TRANS)
+        else:
+            text = CONTROL_CHARS_RE.sub('', text)
         
-        # Strip leading/trailing whitespace
-        text = text.strip()
+        # Collapse whitespace (line breaks included) and strip
+        text = WHITESPACE_RE.sub(' ', text).strip()
 
         return text
 
@@ -296,6 +545,16 @@ class OCRAgent(Part2Agent):
         Returns:
             Dictionary of extracted entities
         """
+        cache_key = hashlib.blake2b(
+            text.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+        with self._entity_cache_lock:
+            cached = self._entity_cache.get(cache_key)
+            if cached is not None:
+                self._entity_cache.move_to_end(cache_key)
+        if cached is not None:
+            return {key: list(values) for key, values in cached.items()}
+
         entities = {
             "dates": [],
             "amounts": [],
@@ -305,103 +564,226 @@ class OCRAgent(Part2Agent):
         }
 
         try:
+            # Each type keeps its first 10 distinct matches in document order;
+            # scanning stops once 10 are found
+            
             # Extract dates (various formats)
-            date_patterns = [
-                r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b',  # DD/MM/YYYY
-                r'\b\d{4}[/-]\d{1,2}[/-]\d{1,2}\b',    # YYYY-MM-DD
-                r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2},? \d{4}\b'  # Month DD, YYYY
-            ]
-            for pattern in date_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                entities["dates"].extend(matches)
+            entities["dates"] = _first_unique_matches(DATE_RE, text)
 
             # Extract monetary amounts
-            amount_pattern = r'[\$£€¥]\s*[\d,]+\.?\d*|\b\d+[,\.\d]*\s*(?:USD|EUR|GBP|CHF|SGD|HKD)\b'
-            entities["amounts"] = re.findall(amount_pattern, text, re.IGNORECASE)
+            entities["amounts"] = _first_unique_matches(AMOUNT_RE, text)
 
             # Extract emails
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            entities["emails"] = re.findall(email_pattern, text)
+            entities["emails"] = _first_unique_matches(EMAIL_RE, text)
 
             # Extract phone numbers
-            phone_pattern = r'[\+]?[(]?[0-9]{1,3}[)]?[-\s\.]?[(]?[0-9]{1,4}[)]?[-\s\.]?[0-9]{1,4}[-\s\.]?[0-9]{1,9}'
-            entities["phone_numbers"] = re.findall(phone_pattern, text)
+            entities["phone_numbers"] = _first_unique_matches(PHONE_RE, text)
 
             # Extract potential names (Title + Capitalized Words)
-            name_pattern = r'\b(?:Mr|Mrs|Ms|Dr|Prof)\.?\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b'
-            entities["potential_names"] = re.findall(name_pattern, text)
+            entities["potential_names"] = _first_unique_matches(NAME_RE, text)
 
-            # Remove duplicates
-            for key in entities:
-                entities[key] = list(set(entities[key]))[:10]  # Limit to 10 per type
+            with self._entity_cache_lock:
+                self._entity_cache[cache_key] = {key: tuple(values) for key, values in entities.items()}
+                if len(self._entity_cache) > ENTITY_CACHE_SIZE:
+                    self._entity_cache.popitem(last=False)
 
         except Exception as e:
             self.logger.error(f"Error extracting entities: {e}")
 
         return entities
 
-    def _ocr_page_images(self, page, page_num: int) -> str:
+    def _skip_ocr_image(self, page, rects) -> bool:
+        """
+        Check whether an embedded image can be left out of OCR.
+
+        An image is skipped when every placement on the page is tiny, or
+        when the text layer already has text inside it. Images whose
+        placement cannot be resolved are always OCR'd.
+
+        Args:
+            page: PyMuPDF page object
+            rects: Placements of the image, from page.get_image_rects()
+
+        Returns:
+            True if OCR on this image would add nothing
+        """
+        if not rects:
+            return False
+        
+        for rect in rects:
+            if rect.width * rect.height < MIN_OCR_IMAGE_AREA:
+                continue
+            if not page.get_text("text", clip=rect).strip():
+                return False
+        return True
+
+    def _render_page(self, page):
+        """Render a page as a grayscale ndarray at the configured OCR DPI"""
+        # Grayscale keeps the raster at one byte per pixel; EasyOCR takes 2-D arrays as-is
+        pix = page.get_pixmap(dpi=settings.ocr_dpi, colorspace=fitz.csGRAY, alpha=False)
+        return np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)[:, :pix.width]
+
+    def _collect_ocr_input(self, page, page_num: int, image_list: List[tuple]) -> Optional[Dict[str, Any]]:
         """
-        Perform OCR on images within a PDF page using EasyOCR.
+        Gather the pixels to OCR on a PDF page (PyMuPDF work only).
+
+        PyMuPDF is not thread-safe, so this runs on the caller's thread.
+        The result holds only bytes/arrays, which _ocr_collected can
+        process in a worker thread after the document is closed.
 
         Args:
             page: PyMuPDF page object
             page_num: Page number (0-indexed)
+            image_list: The page's page.get_images() entries
 
         Returns:
-            Extracted text from images
+            {"page": ndarray} for a scanned page rendered once,
+            {"images": [[(img_index, image_bytes), ...], ...]} with images
+            grouped by pixel size otherwise, or None if nothing needs OCR
         """
-        if not self.reader:
-            self.logger.warning("EasyOCR not available, cannot OCR images")
-            return ""
+        candidates = []
+        covered_area = 0.0
+        for img_index, img in enumerate(image_list):
+            try:
+                rects = page.get_image_rects(img)
+            except Exception:
+                rects = []
+            if self._skip_ocr_image(page, rects):
+                self.logger.info(
+                    f"Skipping image {img_index + 1} on page {page_num + 1} "
+                    f"(decorative or covered by the text layer)"
+                )
+                continue
+            candidates.append((img_index, img[0]))
+            covered_area += sum(abs(rect & page.rect) for rect in rects)
+        
+        if not candidates:
+            return None
+        
+        # Scanned page (one full-page raster or stitched tiles): render it once
+        if covered_area >= SCANNED_PAGE_COVERAGE * abs(page.rect):
+            try:
+                return {"page": self._render_page(page)}
+            except Exception as render_error:
+                self.logger.error(
+                    f"Error rendering page {page_num + 1}, "
+                    f"falling back to embedded images: {render_error}"
+                )
+        
+        # Extract image bytes, grouped by pixel size: EasyOCR can only stack
+        # same-sized images into one detector batch without resizing them
+        size_groups: Dict[tuple, List[tuple]] = {}
+        for img_index, xref in candidates:
+            try:
+                base_image = page.parent.extract_image(xref)
+                size = (base_image["width"], base_image["height"])
+                size_groups.setdefault(size, []).append((img_index, base_image["image"]))
+            except Exception as img_error:
+                self.logger.error(
+                    f"Error extracting image {img_index + 1} on page {page_num + 1}: {img_error}"
+                )
+        
+        return {"images": list(size_groups.values())} if size_groups else None
 
-        ocr_text = []
+    def _ocr_image(self, image) -> str:
+        """
+        Run the selected OCR engine on one image.
 
+        Args:
+            image: File path, encoded image bytes or a pixel ndarray
+
+        Returns:
+            Recognized text
+        """
+        if self.ocr_backend == "tesseract":
+            if isinstance(image, np.ndarray):
+                pil_image = Image.fromarray(image)
+            else:
+                pil_image = Image.open(io.BytesIO(image) if isinstance(image, bytes) else image)
+            return pytesseract.image_to_string(
+                pil_image, lang=self.tesseract_lang, config=TESSERACT_CONFIG
+            )
+        
+        return " ".join(
+            self.reader.readtext(image, detail=0, batch_size=self._recognizer_batch_size())
+        )
+
+    def _recognizer_batch_size(self) -> int:
+        """EasyOCR recognizer batch size for the loaded reader"""
+        return EASYOCR_GPU_BATCH_SIZE if self._reader_on_gpu else 1
+
+    async def _ocr_page_in_thread(
+        self,
+        ocr_input: Dict[str, Any],
+        page_num: int,
+        ocr_slots: asyncio.Semaphore
+    ) -> str:
+        """Run _ocr_collected in a worker thread, then free the page's OCR slot"""
         try:
-            # Get all images from the page
-            image_list = page.get_images()
-            
-            self.logger.info(f"Found {len(image_list)} images on page {page_num + 1}")
-            
-            for img_index, img in enumerate(image_list):
-                try:
-                    # Extract image
-                    xref = img[0]
-                    base_image = page.parent.extract_image(xref)
-                    image_bytes = base_image["image"]
-                    
-                    # Save to temp file for EasyOCR
-                    temp_image_path = f"temp_ocr_page{page_num}_img{img_index}.png"
-                    with open(temp_image_path, 'wb') as f:
-                        f.write(image_bytes)
-                    
-                    # Perform OCR with EasyOCR
-                    self.logger.info(
-                        f"Running EasyOCR on page {page_num + 1}, image {img_index + 1}"
-                    )
-                    result = self.reader.readtext(temp_image_path)
-                    text = " ".join([item[1] for item in result])
-                    
-                    # Cleanup temp file
-                    if os.path.exists(temp_image_path):
-                        os.remove(temp_image_path)
-                    
-                    if text.strip():
-                        ocr_text.append(text)
-                        self.logger.info(
-                            f"Extracted {len(text)} characters from image {img_index + 1}"
-                        )
-                    
-                except Exception as img_error:
-                    self.logger.error(
-                        f"Error OCRing image {img_index + 1} on page {page_num + 1}: {img_error}"
-                    )
-                    # Cleanup temp file on error
-                    if os.path.exists(temp_image_path):
-                        os.remove(temp_image_path)
-                    continue
+            return await asyncio.to_thread(self._ocr_collected, ocr_input, page_num)
+        finally:
+            ocr_slots.release()
 
-        except Exception as e:
-            self.logger.error(f"Error in OCR processing for page {page_num + 1}: {e}")
+    def _ocr_collected(self, ocr_input: Dict[str, Any], page_num: int) -> str:
+        """
+        Perform OCR on pixels gathered by _collect_ocr_input.
+
+        Args:
+            ocr_input: Rendered page or grouped image bytes
+            page_num: Page number (0-indexed)
+
+        Returns:
+            Extracted text from the page
+        """
+        if "page" in ocr_input:
+            pixels = ocr_input["page"]
+            try:
+                self.logger.info(
+                    f"Running {self.ocr_backend} on rendered page {page_num + 1} "
+                    f"({pixels.shape[1]}x{pixels.shape[0]})"
+                )
+                text = self._ocr_image(pixels)
+                if text.strip():
+                    self.logger.info(f"Extracted {len(text)} characters from rendered page")
+                return text
+            except Exception as e:
+                self.logger.error(f"Error in OCR processing for page {page_num + 1}: {e}")
+                return ""
+        
+        ocr_text = []
+        texts: Dict[int, str] = {}
+        for group in ocr_input["images"]:
+            indices = [img_index for img_index, _ in group]
+            image_numbers = ", ".join(str(i + 1) for i in indices)
+            try:
+                # Perform OCR (the bytes are decoded in memory, no temp file)
+                self.logger.info(
+                    f"Running {self.ocr_backend} on page {page_num + 1}, image(s) {image_numbers}"
+                )
+                if len(group) == 1 or self.ocr_backend != "easyocr":
+                    results = [self._ocr_image(image_bytes) for _, image_bytes in group]
+                else:
+                    results = [
+                        " ".join(result) for result in self.reader.readtext_batched(
+                            [image_bytes for _, image_bytes in group], detail=0,
+                            batch_size=self._recognizer_batch_size()
+                        )
+                    ]
+                for img_index, text in zip(indices, results):
+                    texts[img_index] = text
+            except Exception as img_error:
+                self.logger.error(
+                    f"Error OCRing image(s) {image_numbers} on page {page_num + 1}: {img_error}"
+                )
+                continue
+        
+        # Keep page order of images
+        for img_index in sorted(texts):
+            text = texts[img_index]
+            if text.strip():
+                ocr_text.append(text)
+                self.logger.info(
+                    f"Extracted {len(text)} characters from image {img_index + 1}"
+                )
 
         return "\n\n".join(ocr_text)
@@ -4,16 +4,72 @@ and assesses document integrity. Designed to be resilient if optional
 libraries are unavailable.
 """
 
+import asyncio
+import copy
 import hashlib
 import logging
+import mmap
 import os
+import re
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from agents import Part2Agent
 
 logger = logging.getLogger(__name__)
 
+# Optional dependency: PyMuPDF. Imported once per process; agents are built
+# per document, and a failed import would otherwise be retried each time
+try:
+    import fitz  # type: ignore
+    PYMUPDF_AVAILABLE = True
+    logger.info("PyMuPDF available for PDF analysis")
+except Exception:
+    fitz = None
+    PYMUPDF_AVAILABLE = False
+    logger.warning("PyMuPDF not available - PDF forensics limited")
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Readers accept the %PDF- header anywhere in the first 1024 bytes; the
+# linearization dictionary must sit there too
+PDF_HEADER_BYTES = 1024
+LINEARIZED_HEADER_BYTES = 1024
+
+# PDF date string up to its timezone suffix ("D:YYYYMMDDHHmmSS+hh'mm'")
+PDF_DATE_RE = re.compile(r"(?:D:)?([^+\-Z]*)")
+
+# Pages compared by the uniform page size check
+UNIFORM_PAGE_SAMPLE = 20
+
+# Process-wide LRU of forensics results keyed by (path, size, mtime)
+RESULT_CACHE_SIZE = 128
+
+# Documents analyzed at once by execute_batch (each holds a file mapping open;
+# MuPDF still parses them one at a time on the event loop thread)
+BATCH_MAX_CONCURRENT = 8
+
+
+def _build_keyword_automaton(categories: Dict[str, Set[str]]) -> Optional[Any]:
+    """Aho-Corasick automaton mapping each keyword to the categories it belongs to"""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    keyword_categories: Dict[str, List[str]] = {}
+    for category, keywords in categories.items():
+        for keyword in keywords:
+            keyword_categories.setdefault(keyword, []).append(category)
+    automaton = ahocorasick.Automaton()
+    for keyword, names in keyword_categories.items():
+        automaton.add_word(keyword, tuple(names))
+    automaton.make_automaton()
+    return automaton
+
 
 class PDFForensicsAgent(Part2Agent):
     """Agent: PDF forensics - metadata, tampering detection, integrity analysis"""
@@ -40,19 +96,26 @@ class PDFForensicsAgent(Part2Agent):
         'google docs', 'wordperfect'
     }
 
+    # All keyword sets in one automaton, so creator and producer are scanned
+    # once instead of once per keyword (None without pyahocorasick)
+    _SOFTWARE_AUTOMATON = _build_keyword_automaton({
+        "trusted": TRUSTED_SOFTWARE,
+        "suspicious": SUSPICIOUS_SOFTWARE,
+        "image_editor": IMAGE_EDITING_SOFTWARE,
+        "word_processor": WORD_PROCESSORS,
+    })
+
+    # The same upload is re-run through the workflow (retries, re-analysis); an
+    # unchanged file skips the hash, MuPDF parse and structural scan
+    _result_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+    _result_cache_lock = threading.Lock()
+
     def __init__(self) -> None:
         super().__init__("pdf_forensics")
 
-        # Optional dependency: PyMuPDF
-        self.pymupdf_available = False
-        self.fitz = None
-        try:
-            import fitz  # type: ignore
-            self.fitz = fitz
-            self.pymupdf_available = True
-            logger.info("PyMuPDF available for PDF analysis")
-        except Exception:
-            logger.warning("PyMuPDF not available - PDF forensics limited")
+        # Optional dependency: PyMuPDF (imported at module load)
+        self.pymupdf_available = PYMUPDF_AVAILABLE
+        self.fitz = fitz
 
     async def execute(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -79,27 +142,74 @@ class PDFForensicsAgent(Part2Agent):
         integrity_score = 100
         software_trust_level = "unknown"
         document_hash: Optional[str] = None
+        content: Optional[mmap.mmap] = None
+
+        cache_key = self._result_cache_key(file_path)
+        cached = self._get_cached_result(cache_key)
+        if cached is not None:
+            self.logger.info("   Reusing forensics results for unchanged file")
+            state.update(cached)
+            state["errors"] = errors
+            state["pdf_forensics_executed"] = True
+            return state
 
         try:
             if not os.path.isfile(file_path):
                 raise FileNotFoundError(f"PDF not found: {file_path}")
 
-            # Hash first – cheap and deterministic
+            # Hash and structural scan share one read-only mapping of the file
+            content = self._open_mmap(file_path)
+
+            # Reject non-PDFs before hashing or handing them to MuPDF
+            if content.find(b"%PDF-", 0, PDF_HEADER_BYTES) == -1:
+                forensics_issues.append({
+                    "type": "invalid_magic",
+                    "severity": "critical",
+                    "description": "No %PDF- header in the first 1024 bytes - file is not a PDF"
+                })
+                integrity_score = 0
+                raise ValueError(f"Not a PDF file (no %PDF- header): {file_path}")
+
+            # Hash and structural scan only read the mapping: run them in worker
+            # threads (hashlib releases the GIL). PyMuPDF is not thread-safe, so
+            # metadata is extracted on the calling thread while they run
             self.logger.info("🔒 Calculating document hash...")
-            document_hash = self._calculate_hash(file_path)
-            self.logger.info(f"   Hash: {document_hash[:16]}...")
+            # return_exceptions: both scans finish before the mapping is closed
+            scans = asyncio.gather(
+                asyncio.to_thread(self._calculate_hash, content),
+                asyncio.to_thread(self._detect_structural_tampering, content),
+                return_exceptions=True,
+            )
+            metadata_error: Optional[Exception] = None
+            if self.pymupdf_available:
+                self.logger.info("📊 Extracting PDF metadata...")
+                # Let the scans reach their worker threads first
+                await asyncio.sleep(0)
+                try:
+                    pdf_metadata = self._extract_pdf_metadata(file_path)
+                except Exception as e:
+                    metadata_error = e
+            results = await scans
+            if not isinstance(results[0], BaseException):
+                document_hash = results[0]
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            if metadata_error is not None:
+                raise metadata_error
+            structural_indicators, structural_detected = results[1]
+            self.logger.info("   Hash: %s...", document_hash[:16])
 
             # Metadata (best-effort if PyMuPDF is not available)
             if self.pymupdf_available:
-                self.logger.info("📊 Extracting PDF metadata...")
-                pdf_metadata = self._extract_pdf_metadata(file_path)
-                self.logger.info(f"   Creator: {pdf_metadata.get('creator', 'N/A')}")
-                self.logger.info(f"   Producer: {pdf_metadata.get('producer', 'N/A')}")
-                self.logger.info(f"   Creation Date: {pdf_metadata.get('creation_date', 'N/A')}")
-                self.logger.info(f"   Modification Date: {pdf_metadata.get('mod_date', 'N/A')}")
-                self.logger.info(f"   Pages: {pdf_metadata.get('page_count', 'N/A')}")
-                self.logger.info(f"   Encrypted: {pdf_metadata.get('is_encrypted', 'N/A')}")
-                self.logger.info(f"   Uniform Pages: {pdf_metadata.get('uniform_page_sizes', 'N/A')}")
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info("   Creator: %s", pdf_metadata.get('creator', 'N/A'))
+                    self.logger.info("   Producer: %s", pdf_metadata.get('producer', 'N/A'))
+                    self.logger.info("   Creation Date: %s", pdf_metadata.get('creation_date', 'N/A'))
+                    self.logger.info("   Modification Date: %s", pdf_metadata.get('mod_date', 'N/A'))
+                    self.logger.info("   Pages: %s", pdf_metadata.get('page_count', 'N/A'))
+                    self.logger.info("   Encrypted: %s", pdf_metadata.get('is_encrypted', 'N/A'))
+                    self.logger.info("   Uniform Pages: %s", pdf_metadata.get('uniform_page_sizes', 'N/A'))
             else:
                 forensics_issues.append({
                     "type": "analysis_limited",
@@ -127,22 +237,24 @@ class PDFForensicsAgent(Part2Agent):
             consistency_issues = self._check_metadata_consistency(pdf_metadata)
             forensics_issues.extend(consistency_issues)
             if consistency_issues:
-                self.logger.info(f"   Found {len(consistency_issues)} consistency issue(s)")
+                self.logger.info("   Found %s consistency issue(s)", len(consistency_issues))
                 for issue in consistency_issues:
-                    self.logger.info(f"   - [{issue['severity'].upper()}] {issue['type']}: {issue['description']}")
+                    self.logger.info("   - [%s] %s: %s", issue['severity'].upper(), issue['type'], issue['description'])
                 integrity_score -= min(30, len(consistency_issues) * 10)
             else:
                 self.logger.info("   ✅ Metadata is consistent")
 
             # Tampering detection
             self.logger.info("🕵️  Detecting tampering indicators...")
-            tampering = self._detect_tampering(file_path, pdf_metadata)
+            tampering = self._detect_tampering(
+                structural_indicators, structural_detected, pdf_metadata
+            )
             tampering_indicators = tampering["indicators"]
             if tampering["detected"]:
                 tampering_detected = True
-                self.logger.info(f"   ⚠️  TAMPERING DETECTED! Found {len(tampering_indicators)} indicator(s)")
+                self.logger.info("   ⚠️  TAMPERING DETECTED! Found %s indicator(s)", len(tampering_indicators))
                 for indicator in tampering_indicators:
-                    self.logger.info(f"   - [{indicator['severity'].upper()}] {indicator['type']}: {indicator['description']}")
+                    self.logger.info("   - [%s] %s: %s", indicator['severity'].upper(), indicator['type'], indicator['description'])
                 integrity_score -= 30
             else:
                 self.logger.info("   ✅ No tampering detected")
@@ -151,12 +263,12 @@ class PDFForensicsAgent(Part2Agent):
             self.logger.info("🛠️  Analyzing creation software...")
             sw = self._analyze_software(pdf_metadata)
             software_trust_level = sw["trust_level"]
-            self.logger.info(f"   Software: {sw['software'] or 'unknown'}")
-            self.logger.info(f"   Trust Level: {software_trust_level.upper()}")
+            self.logger.info("   Software: %s", sw['software'] or 'unknown')
+            self.logger.info("   Trust Level: %s", software_trust_level.upper())
             if sw["issues"]:
-                self.logger.info(f"   Found {len(sw['issues'])} software-related issue(s)")
+                self.logger.info("   Found %s software-related issue(s)", len(sw['issues']))
                 for issue in sw["issues"]:
-                    self.logger.info(f"   - [{issue['severity'].upper()}] {issue['type']}: {issue['description']}")
+                    self.logger.info("   - [%s] %s: %s", issue['severity'].upper(), issue['type'], issue['description'])
             else:
                 self.logger.info("   ✅ Software appears legitimate")
             forensics_issues.extend(sw["issues"])
@@ -166,9 +278,9 @@ class PDFForensicsAgent(Part2Agent):
             quality = self._assess_document_quality(file_path, pdf_metadata)
             forensics_issues.extend(quality)
             if quality:
-                self.logger.info(f"   Found {len(quality)} quality issue(s)")
+                self.logger.info("   Found %s quality issue(s)", len(quality))
                 for issue in quality:
-                    self.logger.info(f"   - [{issue['severity'].upper()}] {issue['type']}: {issue['description']}")
+                    self.logger.info("   - [%s] %s: %s", issue['severity'].upper(), issue['type'], issue['description'])
                 integrity_score -= min(20, len(quality) * 5)
             else:
                 self.logger.info("   ✅ Document quality is good")
@@ -176,16 +288,29 @@ class PDFForensicsAgent(Part2Agent):
             # Clamp score
             integrity_score = max(0, min(100, integrity_score))
             
-            self.logger.info(f"")
-            self.logger.info(f"📊 FINAL INTEGRITY SCORE: {integrity_score}/100")
-            self.logger.info(f"   - Tampering: {'YES' if tampering_detected else 'NO'}")
-            self.logger.info(f"   - Software Trust: {software_trust_level.upper()}")
-            self.logger.info(f"   - Total Issues: {len(forensics_issues)}")
-            self.logger.info(f"   - Tampering Indicators: {len(tampering_indicators)}")
+            self.logger.info("")
+            self.logger.info("📊 FINAL INTEGRITY SCORE: %s/100", integrity_score)
+            self.logger.info("   - Tampering: %s", 'YES' if tampering_detected else 'NO')
+            self.logger.info("   - Software Trust: %s", software_trust_level.upper())
+            self.logger.info("   - Total Issues: %s", len(forensics_issues))
+            self.logger.info("   - Tampering Indicators: %s", len(tampering_indicators))
+
+            self._store_cached_result(cache_key, {
+                "pdf_metadata": pdf_metadata,
+                "tampering_detected": tampering_detected,
+                "tampering_indicators": tampering_indicators,
+                "software_trust_level": software_trust_level,
+                "integrity_score": integrity_score,
+                "forensics_issues": forensics_issues,
+                "document_hash": document_hash,
+            })
 
         except Exception as e:
-            self.logger.error(f"PDF forensics error: {e}")
+            self.logger.error("PDF forensics error: %s", e)
             errors.append(f"pdf_forensics_error: {str(e)}")
+        finally:
+            if content is not None:
+                content.close()
 
         # Update state
         state["pdf_metadata"] = pdf_metadata
@@ -200,13 +325,70 @@ class PDFForensicsAgent(Part2Agent):
 
         return state
 
+    async def execute_batch(self, states: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute PDF forensics for several documents.
+
+        Library entry point for bulk re-analysis; the document workflow calls
+        execute once per document. Up to ``BATCH_MAX_CONCURRENT`` documents run
+        concurrently in this process: their hashes and structural scans overlap
+        in worker threads, while MuPDF metadata extraction runs on the event
+        loop thread and so handles one document at a time.
+
+        Args:
+            states: Workflow states, each with a file_path
+
+        Returns:
+            The same states, updated as by execute
+        """
+        self.logger.info("Executing PDFForensicsAgent on %s document(s)", len(states))
+        slots = asyncio.Semaphore(BATCH_MAX_CONCURRENT)
+
+        async def run(state: Dict[str, Any]) -> Dict[str, Any]:
+            async with slots:
+                return await self.execute(state)
+
+        return list(await asyncio.gather(*(run(state) for state in states)))
+
     # ----- Helpers -----
-    def _calculate_hash(self, file_path: str) -> str:
-        h = hashlib.sha256()
+    def _result_cache_key(self, file_path: str) -> Optional[tuple]:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+
+    def _get_cached_result(self, key: Optional[tuple]) -> Optional[Dict[str, Any]]:
+        """Copy of the cached results for key (callers may mutate their state)"""
+        if key is None:
+            return None
+        with self._result_cache_lock:
+            result = self._result_cache.get(key)
+            if result is None:
+                return None
+            self._result_cache.move_to_end(key)
+        return copy.deepcopy(result)
+
+    def _store_cached_result(self, key: Optional[tuple], result: Dict[str, Any]) -> None:
+        if key is None:
+            return
+        result = copy.deepcopy(result)
+        with self._result_cache_lock:
+            self._result_cache[key] = result
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+
+    def _open_mmap(self, file_path: str) -> mmap.mmap:
+        """Map the file read-only; the mapping stays valid after the descriptor closes"""
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(1024 * 1024), b""):
-                h.update(chunk)
-        return h.hexdigest()
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError(f"PDF is empty: {file_path}")
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _calculate_hash(self, content: mmap.mmap) -> str:
+        # hashlib takes the buffer directly (no copy) and hashes it in C
+        return hashlib.sha256(content).hexdigest()
 
     def _extract_pdf_metadata(self, file_path: str) -> Dict[str, Any]:
         assert self.fitz is not None
@@ -230,12 +412,15 @@ class PDFForensicsAgent(Part2Agent):
 
     def _check_uniform_page_sizes(self, doc: Any) -> Optional[bool]:
         try:
-            sizes = []
-            for i in range(min(20, getattr(doc, "page_count", 0))):
-                page = doc.load_page(i)
-                r = page.rect
-                sizes.append((round(r.width, 3), round(r.height, 3)))
-            return len(set(sizes)) == 1 if sizes else None
+            first_size = None
+            for i in range(min(UNIFORM_PAGE_SAMPLE, getattr(doc, "page_count", 0))):
+                r = doc.load_page(i).rect
+                size = (round(r.width, 3), round(r.height, 3))
+                if first_size is None:
+                    first_size = size
+                elif size != first_size:
+                    return False
+            return True if first_size is not None else None
         except Exception:
             return None
 
@@ -265,77 +450,126 @@ class PDFForensicsAgent(Part2Agent):
 
     def _analyze_software(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
         issues: List[Dict[str, Any]] = []
-        creator = (metadata.get("creator") or "").lower()
-        producer = (metadata.get("producer") or "").lower()
+        creator_raw = metadata.get("creator") or ""
+        producer_raw = metadata.get("producer") or ""
+        creator = creator_raw.lower()
+        producer = producer_raw.lower()
         software = creator or producer
 
+        # Keywords match case-folded text (lower() leaves e.g. ligatures unfolded);
+        # the reported names keep their lowercase form
+        categories = self._software_categories(creator_raw.casefold(), producer_raw.casefold())
         trust = "unknown"
         # Trusted
-        for t in self.TRUSTED_SOFTWARE:
-            if t in creator or t in producer:
-                trust = "trusted"
-                break
+        if "trusted" in categories:
+            trust = "trusted"
         # Suspicious/editor
-        for s in self.SUSPICIOUS_SOFTWARE:
-            if s in creator or s in producer:
-                trust = "suspicious"
-                issues.append({
-                    "type": "suspicious_software",
-                    "severity": "high",
-                    "description": f"Document created with suspicious tool: {software or 'unknown'}"
-                })
-                break
-        for e in self.IMAGE_EDITING_SOFTWARE:
-            if e in creator or e in producer:
-                trust = "image_editor"
-                issues.append({
-                    "type": "image_editing_software",
-                    "severity": "critical",
-                    "description": f"Image editor detected in metadata: {software or 'unknown'}"
-                })
-                break
-        for w in self.WORD_PROCESSORS:
-            if w in creator:
-                issues.append({
-                    "type": "word_processor_origin",
-                    "severity": "medium",
-                    "description": f"Document originated from word processor: {creator}"
-                })
-                break
+        if "suspicious" in categories:
+            trust = "suspicious"
+            issues.append({
+                "type": "suspicious_software",
+                "severity": "high",
+                "description": f"Document created with suspicious tool: {software or 'unknown'}"
+            })
+        if "image_editor" in categories:
+            trust = "image_editor"
+            issues.append({
+                "type": "image_editing_software",
+                "severity": "critical",
+                "description": f"Image editor detected in metadata: {software or 'unknown'}"
+            })
+        if "word_processor" in categories:
+            issues.append({
+                "type": "word_processor_origin",
+                "severity": "medium",
+                "description": f"Document originated from word processor: {creator}"
+            })
 
         return {"trust_level": trust, "software": software, "issues": issues}
 
-    def _detect_tampering(self, pdf_path: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    def _software_categories(self, creator: str, producer: str) -> Set[str]:
+        """
+        Keyword categories found in the (case-folded) creator/producer strings.
+
+        Word processors are matched against the creator only.
+        """
+        # NUL never occurs in a keyword, so no match spans both strings
+        metadata_text = f"{creator}\0{producer}"
+        if self._SOFTWARE_AUTOMATON is None:
+            categories = {
+                category for category, keywords in (
+                    ("trusted", self.TRUSTED_SOFTWARE),
+                    ("suspicious", self.SUSPICIOUS_SOFTWARE),
+                    ("image_editor", self.IMAGE_EDITING_SOFTWARE),
+                )
+                if any(k in metadata_text for k in keywords)
+            }
+            if any(w in creator for w in self.WORD_PROCESSORS):
+                categories.add("word_processor")
+            return categories
+
+        categories: Set[str] = set()
+        for end, names in self._SOFTWARE_AUTOMATON.iter(metadata_text):
+            in_creator = end < len(creator)
+            for name in names:
+                if name != "word_processor" or in_creator:
+                    categories.add(name)
+        return categories
+
+    def _detect_tampering(
+        self,
+        structural_indicators: List[Dict[str, Any]],
+        structural_detected: bool,
+        metadata: Dict[str, Any],
+    ) -> Dict[str, Any]:
         indicators: List[Dict[str, Any]] = []
-        # Structural checks
-        indicators.extend(self._detect_structural_tampering(pdf_path))
+        # Structural checks (scanned alongside hashing in execute)
+        indicators.extend(structural_indicators)
+        detected = structural_detected
 
-        detected = any(ind.get("severity") in {"high", "critical"} for ind in indicators)
         return {"detected": detected, "indicators": indicators}
 
-    def _detect_structural_tampering(self, pdf_path: str) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _count_occurrences(content: mmap.mmap, needle: bytes) -> int:
+        """Non-overlapping occurrences of needle (bytes.count semantics)"""
+        count = 0
+        pos = content.find(needle)
+        while pos != -1:
+            count += 1
+            pos = content.find(needle, pos + len(needle))
+        return count
+
+    def _detect_structural_tampering(self, content: mmap.mmap) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Scan the raw file for incremental-update markers.
+
+        Returns:
+            (indicators, detected) - detected is set when a high or critical
+            indicator is recorded
+        """
         issues: List[Dict[str, Any]] = []
+        detected = False
         try:
-            with open(pdf_path, "rb") as f:
-                content = f.read()
-            xref = content.count(b"xref")
-            self.logger.debug(f"   Structural check: {xref} xref table(s) found")
+            xref = self._count_occurrences(content, b"xref")
+            self.logger.debug("   Structural check: %s xref table(s) found", xref)
             if xref > 1:
                 issues.append({
                     "type": "multiple_xref_tables",
                     "severity": "critical",
                     "description": f"Multiple xref tables detected ({xref})"
                 })
-            eof = content.count(b"%%EOF")
-            self.logger.debug(f"   Structural check: {eof} EOF marker(s) found")
+                detected = True
+            eof = self._count_occurrences(content, b"%%EOF")
+            self.logger.debug("   Structural check: %s EOF marker(s) found", eof)
             if eof > 1:
                 issues.append({
                     "type": "multiple_eof_markers",
                     "severity": "high",
                     "description": f"Multiple EOF markers detected ({eof})"
                 })
-            linearized = b"/Linearized" in content
-            self.logger.debug(f"   Structural check: Linearized={linearized}")
+                detected = True
+            linearized = content.find(b"/Linearized", 0, LINEARIZED_HEADER_BYTES) != -1
+            self.logger.debug("   Structural check: Linearized=%s", linearized)
             if not linearized and xref > 1:
                 issues.append({
                     "type": "non_linearized_updates",
@@ -343,8 +577,8 @@ class PDFForensicsAgent(Part2Agent):
                     "description": "Non-linearized PDF with incremental updates"
                 })
         except Exception as e:
-            self.logger.debug(f"Structural tampering check failed: {e}")
-        return issues
+            self.logger.debug("Structural tampering check failed: %s", e)
+        return issues, detected
 
     def _assess_document_quality(self, pdf_path: str, metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
         issues: List[Dict[str, Any]] = []
@@ -372,13 +606,18 @@ class PDFForensicsAgent(Part2Agent):
         if not pdf_date_str:
             return None
         try:
-            s = pdf_date_str
-            if s.startswith("D:"):
-                s = s[2:]
-            s = s.split("+")[0].split("-")[0].split("Z")[0]
+            s = PDF_DATE_RE.match(pdf_date_str).group(1)
+            # Fixed-width ASCII digit fields parse directly; strptime handles anything else
             if len(s) >= 14:
+                if s[:14].isascii() and s[:14].isdigit():
+                    return datetime(
+                        int(s[:4]), int(s[4:6]), int(s[6:8]),
+                        int(s[8:10]), int(s[10:12]), int(s[12:14])
+                    )
                 return datetime.strptime(s[:14], "%Y%m%d%H%M%S")
             if len(s) >= 8:
+                if s[:8].isascii() and s[:8].isdigit():
+                    return datetime(int(s[:4]), int(s[4:6]), int(s[6:8]))
                 return datetime.strptime(s[:8], "%Y%m%d")
         except Exception:
             return None
@@ -26,14 +26,14 @@ class ReportGeneratorAgent(Part2Agent):
         Returns:
             Updated state with risk assessment
         """
-        self.logger.info(f"📝 === EXECUTING ReportGeneratorAgent ===")
+        self.logger.info("📝 === EXECUTING ReportGeneratorAgent ===")
 
         # Calculate risk score from all findings
-        self.logger.info(f"DEBUG: Calculating risk score from findings...")
+        self.logger.info("DEBUG: Calculating risk score from findings...")
         risk_score, risk_band, risk_factors = self._calculate_risk_score(state)
         
-        self.logger.info(f"DEBUG: Calculated risk_score={risk_score}, risk_band={risk_band}")
-        self.logger.info(f"DEBUG: risk_factors={risk_factors}")
+        self.logger.info("DEBUG: Calculated risk_score=%s, risk_band=%s", risk_score, risk_band)
+        self.logger.info("DEBUG: risk_factors=%s", risk_factors)
         
         # Set risk values in state
         state["overall_risk_score"] = risk_score
@@ -41,7 +41,7 @@ class ReportGeneratorAgent(Part2Agent):
         state["risk_factors"] = risk_factors
         state["report_generator_executed"] = True
 
-        self.logger.info(f"✅ ReportGenerator complete - Score: {risk_score}, Band: {risk_band}")
+        self.logger.info("✅ ReportGenerator complete - Score: %s, Band: %s", risk_score, risk_band)
 
         return state
 
@@ -62,12 +62,6 @@ class ReportGeneratorAgent(Part2Agent):
         background_findings = state.get("background_check_findings", [])
         cross_ref_findings = state.get("cross_reference_findings", [])
         
-        # Count findings by severity
-        critical_count = 0
-        high_count = 0
-        medium_count = 0
-        low_count = 0
-        
         all_findings = (
             format_findings + content_findings + image_findings + 
             background_findings + cross_ref_findings
@@ -84,19 +78,16 @@ class ReportGeneratorAgent(Part2Agent):
             else:
                 severity = "low"
                 
+            # Weight findings by severity
             if severity == "critical":
-                critical_count += 1
                 risk_score += 25
                 risk_factors.append(f"Critical: {finding.get('type', 'Unknown')}")
             elif severity == "high":
-                high_count += 1
                 risk_score += 15
                 risk_factors.append(f"High: {finding.get('type', 'Unknown')}")
             elif severity == "medium":
-                medium_count += 1
                 risk_score += 8
             elif severity == "low":
-                low_count += 1
                 risk_score += 3
         
         # Check for PEP/Sanctions
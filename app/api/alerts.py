@@ -2,6 +2,9 @@
 Alerts API Endpoints
 
 Endpoints for managing and viewing alerts.
+
+Handlers that only make blocking SQLAlchemy calls are plain ``def``:
+FastAPI runs them in its threadpool instead of on the event loop.
 """
 
 import logging
@@ -16,6 +19,7 @@ from app.schemas.alert import (
     AlertListResponse,
     AlertResponse,
 )
+from app.api.pagination import keyset_page
 from db.database import get_db
 from db.models import Alert, AlertRole, AlertSeverity, AlertStatus
 from services.alert_service import AlertService
@@ -27,15 +31,20 @@ router = APIRouter()
 
 
 @router.get("", response_model=AlertListResponse)
-async def list_alerts(
+def list_alerts(
     role: Optional[str] = Query(None),
     severity: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     page_size: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
 ) -> AlertListResponse:
-    """List alerts with filtering."""
+    """List alerts with filtering, newest first.
+
+    Pass the returned ``next_cursor`` as ``cursor`` to fetch the next page
+    without an offset scan; ``page`` is only used when no cursor is given.
+    """
     query = db.query(Alert)
 
     if role:
@@ -45,11 +54,9 @@ async def list_alerts(
     if status:
         query = query.filter(Alert.status == status)
 
-    total = query.count()
-    alerts = query.order_by(Alert.created_at.desc()).offset((page - 1) * page_size).limit(page_size).all()
+    alerts, has_more, next_cursor = keyset_page(query, Alert, page, page_size, cursor)
 
     return AlertListResponse(
-        total=total,
         alerts=[
             AlertResponse(
                 alert_id=alert.alert_id,
@@ -74,6 +81,8 @@ async def list_alerts(
         ],
         page=page,
         page_size=page_size,
+        has_more=has_more,
+        next_cursor=next_cursor,
     )
 
 
@@ -113,7 +122,7 @@ async def get_alert(
 
 
 @router.post("/{alert_id}/acknowledge", response_model=AlertResponse)
-async def acknowledge_alert(
+def acknowledge_alert(
     alert_id: str,
     request: AlertAcknowledgeRequest,
     db: Session = Depends(get_db),
@@ -194,7 +203,7 @@ async def get_dashboard_stats(
 
 
 @router.get("/transaction/{transaction_id}", response_model=AlertListResponse)
-async def get_transaction_alerts(
+def get_transaction_alerts(
     transaction_id: str,
     db: Session = Depends(get_db),
 ) -> AlertListResponse:
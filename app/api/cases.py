@@ -2,6 +2,9 @@
 Cases API Endpoints
 
 Endpoints for case management.
+
+Handlers that only make blocking SQLAlchemy calls are plain ``def``:
+FastAPI runs them in its threadpool instead of on the event loop.
 """
 
 import logging
@@ -16,6 +19,7 @@ from app.schemas.case import (
     CaseResponse,
     CaseUpdate,
 )
+from app.api.pagination import keyset_page
 from db.database import get_db
 from db.models import Case
 
@@ -25,14 +29,19 @@ router = APIRouter()
 
 
 @router.get("", response_model=CaseListResponse)
-async def list_cases(
+def list_cases(
     status: Optional[str] = Query(None),
     case_type: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     page_size: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
 ) -> CaseListResponse:
-    """List cases with filtering."""
+    """List cases with filtering, newest first.
+
+    Pass the returned ``next_cursor`` as ``cursor`` to fetch the next page
+    without an offset scan; ``page`` is only used when no cursor is given.
+    """
     query = db.query(Case)
 
     if status:
@@ -40,11 +49,9 @@ async def list_cases(
     if case_type:
         query = query.filter(Case.case_type == case_type)
 
-    total = query.count()
-    cases = query.order_by(Case.created_at.desc()).offset((page - 1) * page_size).limit(page_size).all()
+    cases, has_more, next_cursor = keyset_page(query, Case, page, page_size, cursor)
 
     return CaseListResponse(
-        total=total,
         cases=[
             CaseResponse(
                 case_id=case.case_id,
@@ -68,6 +75,8 @@ async def list_cases(
         ],
         page=page,
         page_size=page_size,
+        has_more=has_more,
+        next_cursor=next_cursor,
     )
 
 
@@ -0,0 +1,86 @@
+"""
+Keyset Pagination Helpers
+
+Shared cursor handling for list endpoints ordered by ``(created_at DESC, id DESC)``.
+A cursor is the URL-safe base64 of ``"<created_at ISO>|<id>"`` for the last row
+of the previous page, so fetching the next page is an index range scan instead
+of an ``OFFSET`` walk plus a ``COUNT(*)`` over the whole filtered table.
+"""
+
+import base64
+import binascii
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """Encode a ``(created_at, id)`` key as an opaque cursor string."""
+    raw = f"{created_at.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """
+    Decode a cursor produced by :func:`encode_cursor`.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (ValueError, UnicodeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+
+
+def keyset_page(
+    query: Query,
+    model: Any,
+    page: int,
+    page_size: int,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Any], bool, Optional[str]]:
+    """
+    Fetch one page of ``query`` ordered by ``(created_at DESC, id DESC)``.
+
+    With a ``cursor`` the page starts right after the encoded key; without one
+    the legacy ``page`` offset is used. One extra row is fetched to report
+    whether more rows follow.
+
+    Args:
+        query: Filtered query over ``model``
+        model: Mapped class with ``created_at`` and ``id`` columns
+        page: 1-based page number, ignored when ``cursor`` is given
+        page_size: Rows per page
+        cursor: Cursor returned as ``next_cursor`` by the previous page
+
+    Returns:
+        Tuple of (rows, has_more, next_cursor)
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(
+            or_(
+                model.created_at < created_at,
+                and_(model.created_at == created_at, model.id < row_id),
+            )
+        )
+
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if not cursor:
+        query = query.offset((page - 1) * page_size)
+
+    rows = query.limit(page_size + 1).all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+    return rows, has_more, next_cursor
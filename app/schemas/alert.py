@@ -61,19 +61,22 @@ class AlertResponse(BaseModel):
 class AlertListResponse(BaseModel):
     """Response schema for list of alerts."""
 
-    total: int
+    total: Optional[int] = None
     alerts: List[AlertResponse]
     page: int = 1
     page_size: int = 100
+    has_more: bool = False
+    next_cursor: Optional[str] = None
     filters: Optional[Dict[str, Any]] = None
 
     class Config:
         json_schema_extra = {
             "example": {
-                "total": 15,
                 "alerts": [],  # List of AlertResponse objects
                 "page": 1,
                 "page_size": 100,
+                "has_more": False,
+                "next_cursor": None,
                 "filters": {
                     "role": "compliance",
                     "status": "pending",
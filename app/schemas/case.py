@@ -114,19 +114,22 @@ class CaseResponse(BaseModel):
 class CaseListResponse(BaseModel):
     """Response schema for list of cases."""
 
-    total: int
+    total: Optional[int] = None
     cases: List[CaseResponse]
     page: int = 1
     page_size: int = 100
+    has_more: bool = False
+    next_cursor: Optional[str] = None
     filters: Optional[Dict[str, Any]] = None
 
     class Config:
         json_schema_extra = {
             "example": {
-                "total": 8,
                 "cases": [],  # List of CaseResponse objects
                 "page": 1,
                 "page_size": 100,
+                "has_more": False,
+                "next_cursor": None,
                 "filters": {
                     "status": "open",
                     "case_type": "AML",
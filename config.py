@@ -102,6 +102,8 @@ class Settings(BaseSettings):
     tesseract_path: str = Field(default="/usr/local/bin/tesseract")
     tesseract_lang: str = Field(default="eng+chi_sim")
     ocr_dpi: int = Field(default=300)
+    ocr_backend: str = Field(default="easyocr", env="OCR_BACKEND")  # "easyocr", "tesseract" or "auto" (Tesseract on CPU-only hosts, EasyOCR on GPU)
+    ocr_max_concurrent_pages: int = Field(default=4, env="OCR_MAX_CONCURRENT_PAGES")  # Pages OCR'd in parallel worker threads
     
     # Crawler
     crawler_user_agent: str = Field(
@@ -160,6 +162,7 @@ class Settings(BaseSettings):
     document_max_pages: int = Field(default=100, env="DOCUMENT_MAX_PAGES")
     document_allowed_types: List[str] = Field(default=["pdf"], env="DOCUMENT_ALLOWED_TYPES")  # PDF only for now
     image_max_size_mb: int = Field(default=20, env="IMAGE_MAX_SIZE_MB")
+    full_spell_threshold: int = Field(default=3000, env="FULL_SPELL_THRESHOLD")  # Words spell-checked in full; larger docs are sampled (0 = never sample)
 
     # Accept CSV or JSON array for list-like envs
     @field_validator("cors_origins", mode="before")
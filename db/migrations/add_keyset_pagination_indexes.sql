@@ -0,0 +1,10 @@
+-- Migration: Add Composite Indexes for Keyset Pagination
+-- Purpose: Let GET /alerts and GET /cases page by (created_at, id) cursor
+--          with an index range scan instead of OFFSET + COUNT(*)
+-- Date: 2026-10-18
+
+CREATE INDEX IF NOT EXISTS idx_alert_created_id
+    ON alerts (created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_case_created_id
+    ON cases (created_at DESC, id DESC);
@@ -301,6 +301,7 @@ class Alert(Base):
         Index('idx_alert_role_status', 'role', 'status'),
         Index('idx_alert_severity_status', 'severity', 'status'),
         Index('idx_alert_sla', 'sla_deadline', 'sla_breached'),
+        Index('idx_alert_created_id', created_at.desc(), id.desc()),  # Keyset pagination
     )
 
 
@@ -347,6 +348,7 @@ class Case(Base):
     __table_args__ = (
         Index('idx_case_status', 'status'),
         Index('idx_case_severity', 'severity'),
+        Index('idx_case_created_id', created_at.desc(), id.desc()),  # Keyset pagination
     )
 
 
@@ -192,10 +192,13 @@ export interface Alert {
 }
 
 export interface AlertListResponse {
-  total: number;
+  total?: number | null;
   alerts: Alert[];
   page: number;
   page_size: number;
+  has_more: boolean;
+  next_cursor?: string | null;
+  filters?: Record<string, any> | null;
 }
 
 export interface RemediationResponse {
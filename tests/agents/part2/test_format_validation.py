@@ -0,0 +1,102 @@
+"""
+Regression tests for FormatValidationAgent scan helpers.
+
+Each fast path is checked against the straightforward implementation it replaced.
+"""
+import random
+import re
+
+import pytest
+
+import agents.part2.format_validation as format_validation
+from agents.part2.format_validation import FormatValidationAgent, _count_lowercase_sentence_starts
+
+
+@pytest.fixture
+def agent():
+    return FormatValidationAgent()
+
+
+def _reference_lowercase_starts(text: str):
+    """Original split-based count of lowercase sentence starts."""
+    sentences = re.split(r'[.!?]\s+', text)
+    lowercase_starts = sum(1 for s in sentences if s.strip() and s.strip()[0].islower())
+    return lowercase_starts, len(sentences)
+
+
+def _random_text(rng: random.Random, length: int) -> str:
+    alphabet = "aZ. !?\n\téÉß1 ,"
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+class TestLowercaseSentenceStarts:
+    """_count_lowercase_sentence_starts matches re.split on every input."""
+
+    @pytest.mark.parametrize("text", [
+        "",
+        "   ",
+        "hello world",
+        "Hello. world! Again? yes.",
+        "  leading space. étude starts lowercase.\n\nNext",
+        "Trailing terminator.  ",
+        "a.b. c",
+        "...  x",
+    ])
+    def test_known_cases(self, text):
+        assert _count_lowercase_sentence_starts(text) == _reference_lowercase_starts(text)
+
+    def test_random_equivalence(self):
+        rng = random.Random(0)
+        for _ in range(2000):
+            text = _random_text(rng, rng.randint(0, 60))
+            assert _count_lowercase_sentence_starts(text) == _reference_lowercase_starts(text), repr(text)
+
+
+class TestRedFlags:
+    """_detect_red_flags density outliers agree on the NumPy and Python paths."""
+
+    def test_density_outliers_numpy_parity(self, agent, monkeypatch):
+        if not format_validation.NUMPY_AVAILABLE:
+            pytest.skip("NumPy not installed")
+        rng = random.Random(1)
+        counts = [rng.choice([0, 40, 1500, 1600, 5000]) for _ in range(format_validation.NUMPY_MIN_PAGES * 3)]
+        page_texts = [{"text": "x" * c, "char_count": c} for c in counts]
+
+        with_numpy = agent._detect_red_flags("", page_texts)
+        monkeypatch.setattr(format_validation, "NUMPY_AVAILABLE", False)
+        without_numpy = agent._detect_red_flags("", page_texts)
+
+        assert with_numpy == without_numpy
+        assert any(flag["type"] == "inconsistent_density" for flag in with_numpy)
+
+    def test_keywords_and_placeholders(self, agent):
+        text_lower = "please transfer urgent funds. urgent: wire now. lorem ipsum tbd"
+        flags = agent._detect_red_flags(text_lower, [{"text": text_lower, "char_count": len(text_lower)}])
+
+        details = [flag["details"] for flag in flags]
+        assert "Detected suspicious pattern: urgency+transfer" in details
+        assert "Found placeholder text: tbd, lorem ipsum" in details
+
+
+class TestSpelling:
+    """Sampled spell checks report the same misspellings as the full check."""
+
+    def test_sampled_repeated_typos_match_full_check(self, agent):
+        if agent.spell is None:
+            pytest.skip("pyspellchecker not installed")
+        rng = random.Random(0)
+        base = "the agreement between buyer and seller concerning property purchase price".split()
+        typos = ["recieve", "adress", "definately", "seperate", "occured"]
+        words = [rng.choice(base) for _ in range(5000)]
+        for i in range(0, len(words), 50):
+            words[i] = typos[(i // 50) % len(typos)]
+        text = " ".join(words)
+        word_list = agent._WORD_RE.findall(text)
+
+        agent.full_spell_threshold = 0
+        full = agent._check_spelling(text, text.lower(), word_list)
+        agent.full_spell_threshold = 500
+        sampled = agent._check_spelling(text, text.lower(), word_list)
+
+        assert sampled == full
+        assert full[0] == len(typos)
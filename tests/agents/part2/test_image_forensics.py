@@ -0,0 +1,146 @@
+"""
+Regression tests for ImageForensicsAgent analysis reuse and block artifact scan.
+"""
+import io
+
+import numpy as np
+import pytest
+
+import agents.part2.image_forensics as image_forensics
+from agents.part2.image_forensics import ImageForensicsAgent, _TamperContext
+
+
+def _png_bytes(seed: int = 0, size: int = 64) -> bytes:
+    from PIL import Image
+    pixels = (np.random.RandomState(seed).rand(size, size, 3) * 255).astype(np.uint8)
+    buf = io.BytesIO()
+    Image.fromarray(pixels).save(buf, "PNG")
+    return buf.getvalue()
+
+
+def _pdf_images(image_bytes_list):
+    return [
+        {
+            "page": i + 1, "index": 0, "xref": i + 10, "image_bytes": image_bytes,
+            "extension": "png", "width": 64, "height": 64, "colorspace": "rgb",
+        }
+        for i, image_bytes in enumerate(image_bytes_list)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def clear_analysis_cache():
+    ImageForensicsAgent._analysis_cache.clear()
+    yield
+    ImageForensicsAgent._analysis_cache.clear()
+
+
+def _counting_agent(images, calls):
+    """Agent that serves `images` as the PDF's images and counts pixel analyses."""
+    agent = ImageForensicsAgent()
+    if not agent.pil_available:
+        pytest.skip("PIL not installed")
+    detect = agent._detect_ai_generated
+
+    async def counting_detect(*args, **kwargs):
+        calls.append(1)
+        return await detect(*args, **kwargs)
+
+    agent._detect_ai_generated = counting_detect
+    agent._extract_images_from_pdf = lambda file_path: images
+    return agent
+
+
+class TestAnalysisCache:
+    """Identical images are analyzed once; every finding is a private copy."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_images_analyzed_once(self):
+        calls = []
+        logo, photo = _png_bytes(0), _png_bytes(1)
+        agent = _counting_agent(_pdf_images([logo, photo, logo, logo]), calls)
+
+        state = await agent.execute({"file_path": "doc.pdf", "file_format": "pdf", "document_id": "D1"})
+
+        assert len(calls) == 2
+        findings = state["image_findings"]
+        assert [(f["image_index"], f["page"]) for f in findings] == [(0, 1), (1, 2), (2, 3), (3, 4)]
+        assert findings[2]["exif_data"] == findings[0]["exif_data"]
+        assert findings[2]["exif_data"] is not findings[0]["exif_data"]
+
+    @pytest.mark.asyncio
+    async def test_cache_reused_across_agents(self):
+        calls = []
+        images = _pdf_images([_png_bytes(0)])
+        first = await _counting_agent(images, calls).execute(
+            {"file_path": "a.pdf", "file_format": "pdf", "document_id": "A"}
+        )
+        # The document workflow builds a new agent per document
+        second = await _counting_agent(images, calls).execute(
+            {"file_path": "b.pdf", "file_format": "pdf", "document_id": "B"}
+        )
+
+        assert len(calls) == 1
+        assert second["image_findings"] == first["image_findings"]
+
+    @pytest.mark.asyncio
+    async def test_mutating_findings_does_not_touch_cache(self):
+        calls = []
+        images = _pdf_images([_png_bytes(0)])
+        first = await _counting_agent(images, calls).execute(
+            {"file_path": "a.pdf", "file_format": "pdf", "document_id": "A"}
+        )
+        first["image_findings"][0]["exif_data"]["injected"] = True
+        first["image_findings"][0]["tampering_detected"] = "mutated"
+
+        second = await _counting_agent(images, calls).execute(
+            {"file_path": "b.pdf", "file_format": "pdf", "document_id": "B"}
+        )
+
+        finding = second["image_findings"][0]
+        assert "injected" not in finding["exif_data"]
+        assert finding["tampering_detected"] != "mutated"
+
+
+class TestBlockArtifacts:
+    """The numba kernel and the NumPy path report the same full count."""
+
+    @pytest.fixture
+    def agent(self):
+        agent = ImageForensicsAgent()
+        if not agent.cv2_available:
+            pytest.skip("OpenCV/NumPy not installed")
+        return agent
+
+    @pytest.mark.parametrize("shape", [(100, 130), (257, 311), (64, 64), (17, 9), (8, 8)])
+    def test_numba_numpy_parity(self, agent, monkeypatch, shape):
+        if not image_forensics.NUMBA_AVAILABLE:
+            pytest.skip("numba not installed")
+        gray = (np.random.RandomState(1).rand(*shape) * 255).astype(np.uint8)
+        ctx = _TamperContext(img=None, gray=gray, native_gray=gray)
+
+        with_numba = agent._detect_block_artifacts(ctx)
+        monkeypatch.setattr(image_forensics, "NUMBA_AVAILABLE", False)
+        with_numpy = agent._detect_block_artifacts(ctx)
+
+        assert with_numba == with_numpy
+
+    def test_full_count_reported(self, agent, monkeypatch):
+        monkeypatch.setattr(image_forensics, "NUMBA_AVAILABLE", False)
+        gray = (np.random.RandomState(1).rand(100, 130) * 255).astype(np.uint8)
+        ctx = _TamperContext(img=None, gray=gray, native_gray=gray)
+
+        # Brute force over every 8x8 block with a full right or lower neighbour
+        h, w = gray.shape
+        expected = 0
+        for y in range(0, h - 8, 8):
+            for x in range(0, w - 8, 8):
+                right = x + 16 <= w - 1 and abs(
+                    int(gray[y:y + 8, x + 7].mean()) - int(gray[y:y + 8, x + 8].mean())
+                ) > 30
+                below = y + 16 <= h - 1 and abs(
+                    int(gray[y + 7, x:x + 8].mean()) - int(gray[y + 8, x:x + 8].mean())
+                ) > 30
+                expected += right or below
+
+        assert agent._detect_block_artifacts(ctx) == {"suspicious_blocks": expected}
@@ -0,0 +1,114 @@
+"""
+Regression tests for OCRAgent page routing, concurrency and output format.
+
+OCR inference is stubbed out; the tests cover which pages reach OCR, how
+many run at once and how the results are stored.
+"""
+import io
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from agents.part2 import ocr
+from agents.part2.ocr import OCRAgent
+
+NATIVE_TEXT = "Native paragraph text on a mixed page. " * 3
+
+
+def _png_bytes() -> bytes:
+    from PIL import Image
+    pixels = (np.random.RandomState(0).rand(200, 200, 3) * 255).astype(np.uint8)
+    buf = io.BytesIO()
+    Image.fromarray(pixels).save(buf, "PNG")
+    return buf.getvalue()
+
+
+def _write_pdf(path, mixed_pages=()) -> str:
+    """Five full-page scans; pages in mixed_pages get native text and a small photo instead."""
+    png = _png_bytes()
+    doc = ocr.fitz.open()
+    for page_num in range(5):
+        page = doc.new_page()
+        if page_num in mixed_pages:
+            page.insert_text((72, 72), NATIVE_TEXT)
+            page.insert_image(ocr.fitz.Rect(300, 400, 400, 500), stream=png)
+        else:
+            page.insert_image(page.rect, stream=png)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture
+def agent(monkeypatch, tmp_path):
+    monkeypatch.setattr(ocr.settings, "ocr_output_dir", str(tmp_path / "ocr_output"))
+    monkeypatch.setattr(OCRAgent, "_get_reader", classmethod(lambda cls: object()))
+    monkeypatch.setattr(ocr.settings, "ocr_backend", "easyocr")
+    agent = OCRAgent()
+    # Rendered full pages read "SCANNED", embedded photos read "photo"
+    agent._ocr_collected = lambda ocr_input, page_num: "SCANNED" if "page" in ocr_input else "photo"
+    return agent
+
+
+class TestScannedRouting:
+    """Scanned documents skip text extraction only on pages covered by images."""
+
+    @pytest.mark.asyncio
+    async def test_scanned_pages_use_ocr(self, agent, tmp_path):
+        _, page_texts = await agent._process_pdf(_write_pdf(tmp_path / "scan.pdf"), "DOC")
+
+        assert [p["text"] for p in page_texts] == ["SCANNED"] * 5
+        assert all(p["method"] == "easyocr" for p in page_texts)
+
+    @pytest.mark.asyncio
+    async def test_mixed_page_keeps_text_layer(self, agent, tmp_path):
+        _, page_texts = await agent._process_pdf(_write_pdf(tmp_path / "mixed.pdf", mixed_pages={1}), "DOC")
+
+        assert page_texts[1]["method"] == "pdf_text_layer"
+        assert page_texts[1]["text"].startswith("Native paragraph text")
+        assert page_texts[3]["text"] == "SCANNED"
+
+
+class TestConcurrentPages:
+    """Pages are OCR'd in worker threads, at most ocr_max_concurrent_pages at once."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, agent, monkeypatch, tmp_path):
+        monkeypatch.setattr(ocr.settings, "ocr_max_concurrent_pages", 2)
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def slow_ocr(ocr_input, page_num):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            return f"page {page_num + 1}"
+
+        agent._ocr_collected = slow_ocr
+        _, page_texts = await agent._process_pdf(_write_pdf(tmp_path / "scan.pdf"), "DOC")
+
+        assert peak[0] == 2
+        assert [p["text"] for p in page_texts] == [f"page {n}" for n in range(1, 6)]
+
+
+class TestOutputFile:
+    """OCR output is written as per-page JSON lines and read back unchanged."""
+
+    @pytest.mark.asyncio
+    async def test_output_round_trip(self, agent, tmp_path):
+        state = await agent.execute({
+            "file_path": _write_pdf(tmp_path / "mixed.pdf", mixed_pages={0, 2, 4}),
+            "file_format": "pdf",
+            "document_id": "DOC",
+            "errors": [],
+        })
+
+        path = state["ocr_output_path"]
+        assert path.endswith("DOC_ocr.jsonl.zst" if ocr.ZSTD_AVAILABLE else "DOC_ocr.jsonl")
+        assert list(OCRAgent.read_ocr_output(path)) == state["page_texts"]
@@ -0,0 +1,112 @@
+"""
+Regression tests for PDFForensicsAgent result caching and batch execution.
+"""
+import os
+import threading
+
+import pytest
+
+from agents.part2.pdf_forensics import PYMUPDF_AVAILABLE, PDFForensicsAgent
+
+pytestmark = pytest.mark.skipif(not PYMUPDF_AVAILABLE, reason="PyMuPDF not installed")
+
+
+def _write_pdf(path, text: str) -> str:
+    import fitz
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    doc.set_metadata({"producer": "Microsoft Word", "creator": "Microsoft Word"})
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def clear_result_cache():
+    PDFForensicsAgent._result_cache.clear()
+    yield
+    PDFForensicsAgent._result_cache.clear()
+
+
+class TestResultCache:
+    """Unchanged files reuse results; callers always get private copies."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_file_is_served_from_cache(self, tmp_path, monkeypatch):
+        file_path = _write_pdf(tmp_path / "doc.pdf", "Purchase agreement")
+        first = await PDFForensicsAgent().execute({"file_path": file_path, "errors": []})
+
+        def fail(*args, **kwargs):
+            raise AssertionError("cache miss: file was analyzed again")
+
+        monkeypatch.setattr(PDFForensicsAgent, "_open_mmap", fail)
+        second = await PDFForensicsAgent().execute({"file_path": file_path, "errors": []})
+
+        for key in ("document_hash", "pdf_metadata", "forensics_issues", "integrity_score"):
+            assert second[key] == first[key]
+        assert second["pdf_forensics_executed"] is True
+
+    @pytest.mark.asyncio
+    async def test_cached_results_are_copies(self, tmp_path):
+        file_path = _write_pdf(tmp_path / "doc.pdf", "Purchase agreement")
+        first = await PDFForensicsAgent().execute({"file_path": file_path, "errors": []})
+        first["forensics_issues"].append({"type": "injected"})
+        first["pdf_metadata"]["producer"] = "mutated"
+
+        second = await PDFForensicsAgent().execute({"file_path": file_path, "errors": []})
+
+        assert {"type": "injected"} not in second["forensics_issues"]
+        assert second["pdf_metadata"].get("producer") != "mutated"
+
+    @pytest.mark.asyncio
+    async def test_modified_file_is_analyzed_again(self, tmp_path):
+        file_path = _write_pdf(tmp_path / "doc.pdf", "Purchase agreement")
+        first = await PDFForensicsAgent().execute({"file_path": file_path, "errors": []})
+
+        _write_pdf(tmp_path / "doc.pdf", "Purchase agreement, amended")
+        stat = os.stat(file_path)
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        second = await PDFForensicsAgent().execute({"file_path": file_path, "errors": []})
+
+        assert second["document_hash"] != first["document_hash"]
+
+
+class TestExecuteBatch:
+    """execute_batch matches execute and runs MuPDF one document at a time."""
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_single_runs(self, tmp_path):
+        paths = [_write_pdf(tmp_path / f"doc{i}.pdf", f"Document {i}") for i in range(3)]
+        not_pdf = tmp_path / "notes.pdf"
+        not_pdf.write_bytes(b"plain text, no header")
+        paths.append(str(not_pdf))
+
+        singles = []
+        for path in paths:
+            singles.append(await PDFForensicsAgent().execute({"file_path": path, "errors": []}))
+        PDFForensicsAgent._result_cache.clear()
+
+        states = [{"file_path": path, "errors": ["prior"]} for path in paths]
+        batched = await PDFForensicsAgent().execute_batch(states)
+
+        assert batched == states
+        for single, state in zip(singles, batched):
+            assert state["errors"][0] == "prior"
+            assert state["errors"][1:] == single["errors"]
+            for key in ("document_hash", "integrity_score", "forensics_issues", "tampering_detected"):
+                assert state[key] == single[key]
+
+    @pytest.mark.asyncio
+    async def test_metadata_extraction_stays_on_calling_thread(self, tmp_path, monkeypatch):
+        paths = [_write_pdf(tmp_path / f"doc{i}.pdf", f"Document {i}") for i in range(4)]
+        extract = PDFForensicsAgent._extract_pdf_metadata
+        threads = []
+
+        def recording_extract(self, file_path):
+            threads.append(threading.get_ident())
+            return extract(self, file_path)
+
+        monkeypatch.setattr(PDFForensicsAgent, "_extract_pdf_metadata", recording_extract)
+        await PDFForensicsAgent().execute_batch([{"file_path": path, "errors": []} for path in paths])
+
+        assert threads == [threading.get_ident()] * len(paths)
@@ -0,0 +1,110 @@
+"""
+Tests for keyset (cursor) pagination used by the alert and case list endpoints.
+"""
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, DateTime, Uuid, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+from app.api.pagination import decode_cursor, encode_cursor, keyset_page
+
+Base = declarative_base()
+
+
+class Row(Base):
+    """Stand-in for Alert/Case: only the keyset columns matter."""
+    __tablename__ = "rows"
+
+    id = Column(Uuid, primary_key=True)
+    created_at = Column(DateTime, nullable=False)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        start = datetime(2025, 1, 1)
+        # Three rows per timestamp, so the id tie-breaker is exercised
+        for i in range(23):
+            session.add(Row(id=uuid.uuid4(), created_at=start + timedelta(minutes=i // 3)))
+        session.commit()
+        yield session
+
+
+def _expected_order(session):
+    rows = session.query(Row).all()
+    return [r.id for r in sorted(rows, key=lambda r: (r.created_at, r.id), reverse=True)]
+
+
+class TestCursor:
+    """Cursors round-trip and reject malformed input."""
+
+    def test_round_trip(self):
+        created_at = datetime(2025, 3, 4, 5, 6, 7, 891011)
+        row_id = uuid.uuid4()
+        assert decode_cursor(encode_cursor(created_at, row_id)) == (created_at, row_id)
+
+    @pytest.mark.parametrize("cursor", ["garbage!!", "bm90LWEtY3Vyc29y", encode_cursor(datetime(2025, 1, 1), uuid.uuid4())[:-4]])
+    def test_bad_cursor_is_400(self, cursor):
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor(cursor)
+        assert exc_info.value.status_code == 400
+
+
+class TestKeysetPage:
+    """Following next_cursor visits every row once, newest first."""
+
+    def test_walk_all_pages(self, session):
+        seen = []
+        cursor = None
+        while True:
+            rows, has_more, cursor = keyset_page(session.query(Row), Row, 1, 5, cursor)
+            seen.extend(r.id for r in rows)
+            if not has_more:
+                assert cursor is None
+                break
+            assert len(rows) == 5
+
+        assert seen == _expected_order(session)
+
+    def test_page_offset_without_cursor(self, session):
+        rows, has_more, cursor = keyset_page(session.query(Row), Row, 2, 10, None)
+
+        assert [r.id for r in rows] == _expected_order(session)[10:20]
+        assert has_more
+        assert cursor == encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    def test_last_page_exact_fit(self, session):
+        rows, has_more, cursor = keyset_page(session.query(Row), Row, 1, 23, None)
+
+        assert len(rows) == 23
+        assert not has_more
+        assert cursor is None
+
+
+class TestListEndpoints:
+    """The list endpoints turn a malformed cursor into a 400 response."""
+
+    @pytest.fixture
+    def client(self):
+        from app.api import alerts, cases
+        from db.database import get_db
+
+        app = FastAPI()
+        app.include_router(alerts.router, prefix="/alerts")
+        app.include_router(cases.router, prefix="/cases")
+        app.dependency_overrides[get_db] = lambda: MagicMock()
+        return TestClient(app)
+
+    @pytest.mark.parametrize("path", ["/alerts", "/cases"])
+    def test_bad_cursor(self, client, path):
+        response = client.get(path, params={"cursor": "garbage!!"})
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid pagination cursor"